@@ -0,0 +1,218 @@
+"""Throughput and latency of the main API endpoints, written to a JSON report.
+
+Seeds a database with generated blogs, users and admins, then drives each
+endpoint through the Flask test client and through a local threaded WSGI
+server with concurrent clients. Commit the report and pass it back as
+--baseline to flag regressions (exit status 1).
+
+    python benchmarks/api_benchmark.py --output bench.json
+    python benchmarks/api_benchmark.py --baseline bench.json --max-regression 20
+    python benchmarks/api_benchmark.py --database src/database/app.db   # seed that file instead
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash  # noqa: E402
+from werkzeug.serving import make_server  # noqa: E402
+
+from benchmarks.common import ADMIN, percentile  # noqa: E402
+from src.main import create_app  # noqa: E402
+from src.models.blog import Admin, Blog  # noqa: E402
+from src.models.user import User, db  # noqa: E402
+
+CATEGORIES = ('News', 'Engineering', 'Culture', 'Events', 'Products')
+BATCH = 1000
+
+
+def seed(app, posts, users, admins):
+    rng = random.Random(42)
+    start = datetime(2020, 1, 1)
+    with app.app_context():
+        blogs = [{'title': f'Post {i}', 'content': 'Body paragraph text. ' * rng.randint(50, 400),
+                  'excerpt': f'Excerpt for post {i}', 'author': 'Benchmark',
+                  'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i),
+                  'published': rng.random() < 0.8, 'category': rng.choice(CATEGORIES)} for i in range(posts)]
+        password = generate_password_hash('benchmark')
+        for model, rows in (
+            (Blog, blogs),
+            (User, [{'username': f'user{i}', 'email': f'user{i}@example.com'} for i in range(users)]),
+            (Admin, [{'email': f'admin{i}@example.com', 'password': password, 'name': f'Admin {i}'}
+                     for i in range(admins)]),
+        ):
+            for offset in range(0, len(rows), BATCH):
+                db.session.execute(db.insert(model), rows[offset:offset + BATCH])
+            db.session.commit()
+        return [row.id for row in db.session.execute(db.select(Blog.id).where(Blog.published))]
+
+
+def scenarios(blog_ids):
+    rng = random.Random(7)
+    return [
+        ('GET /api/blogs', False, lambda: '/api/blogs'),
+        ('GET /api/blogs/<id>', False, lambda: f'/api/blogs/{rng.choice(blog_ids)}'),
+        ('GET /api/admin/blogs', True, lambda: '/api/admin/blogs'),
+        ('GET /api/users', False, lambda: '/api/users'),
+        ('GET /<path> (static catch-all)', False, lambda: '/about'),
+    ]
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_test_client(app, path, admin, requests):
+    client = app.test_client()
+    if admin:
+        client.post('/api/admin/login', json=ADMIN)
+    latencies, errors = [], 0
+    begin = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path())
+        response.get_data()
+        latencies.append(time.perf_counter() - start)
+        errors += response.status_code >= 400
+    return summarize(latencies, errors, time.perf_counter() - begin)
+
+
+def login_cookie(port):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('POST', '/api/admin/login', json.dumps(ADMIN), {'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    return response.getheader('Set-Cookie').split(';', 1)[0]
+
+
+def run_server(port, path, admin, requests, concurrency):
+    headers = {'Cookie': login_cookie(port)} if admin else {}
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    per_client = max(1, requests // concurrency)
+
+    def worker():
+        samples, failed = [], 0
+        for _ in range(per_client):
+            start = time.perf_counter()
+            conn = http.client.HTTPConnection('127.0.0.1', port)
+            try:
+                conn.request('GET', path(), headers=headers)
+                response = conn.getresponse()
+                response.read()
+                failed += response.status >= 400
+            except OSError:
+                failed += 1
+            finally:
+                conn.close()
+            samples.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(samples)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(latencies, errors[0], time.perf_counter() - begin)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def regressions(report, baseline, max_regression):
+    found = []
+    for name, result in report['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        if before['rps'] and result['rps'] < before['rps'] * (1 - max_regression / 100):
+            found.append(f"{name}: {before['rps']} -> {result['rps']} req/s")
+        if before['p95_ms'] and result['p95_ms'] > before['p95_ms'] * (1 + max_regression / 100):
+            found.append(f"{name}: p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--admins', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=500, help='requests per endpoint and mode')
+    parser.add_argument('--concurrency', type=int, default=8, help='clients against the live server')
+    parser.add_argument('--database', help='SQLite file to seed (default: a temporary one)')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='earlier report to compare against')
+    parser.add_argument('--max-regression', type=float, default=20.0, help='percent')
+    args = parser.parse_args()
+
+    database = args.database or os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(database)}'})
+    blog_ids = seed(app, args.posts, args.users, args.admins)
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # no per-request access log
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {}
+    try:
+        for name, admin, path in scenarios(blog_ids):
+            results[f'test_client {name}'] = run_test_client(app, path, admin, args.requests)
+            results[f'server {name}'] = run_server(server.server_port, path, admin, args.requests,
+                                                   args.concurrency)
+    finally:
+        server.shutdown()
+
+    report = {
+        'meta': {'commit': git_commit(), 'python': platform.python_version(), 'posts': args.posts,
+                 'users': args.users, 'admins': args.admins, 'requests': args.requests,
+                 'concurrency': args.concurrency},
+        'results': results,
+    }
+    with open(args.output, 'w') as out:
+        json.dump(report, out, indent=2, sort_keys=True)
+        out.write('\n')
+
+    print(f"{'endpoint':<52}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, result in results.items():
+        print(f"{name:<52}{result['rps']:>10,.0f}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}{result['errors']:>8}")
+    print(f'Wrote {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.max_regression)
+        for line in found:
+            print(f'REGRESSION {line}')
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Concurrent throughput of the public reads: sync WSGI views vs async ASGI views.
+
+Both paths run in-process against the same seeded database with the response
+cache disabled. The sync path serves at most --threads requests at a time
+(one worker's WEB_THREADS); the async path keeps --concurrency requests in
+flight on one event loop. --db-latency-ms adds a sleep to every query to
+stand in for a networked database.
+
+    python benchmarks/async_benchmark.py --concurrency 64 --db-latency-ms 5
+    python benchmarks/async_benchmark.py --async-driver threadpool
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+from werkzeug.test import EnvironBuilder, run_wsgi_app  # noqa: E402
+
+from benchmarks.common import percentile  # noqa: E402
+from src.main import create_app  # noqa: E402
+from src.models.async_db import async_reader  # noqa: E402
+from src.models.blog import Blog  # noqa: E402
+from src.models.user import User, db  # noqa: E402
+from src.routes.async_public import ASYNC_VIEWS  # noqa: E402
+from src.utils.asgi_bridge import ASGIAdapter  # noqa: E402
+
+PATHS = ('/api/blogs', '/api/blogs/{blog}', '/api/users', '/api/users/{user}')
+
+
+def make_app(args):
+    tmp = tempfile.mkdtemp()
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        'BLOG_CACHE_MAX_ENTRIES': 0,
+        'ASYNC_DB_DRIVER': args.async_driver,
+        'ASYNC_DB_THREADS': args.db_threads,
+        'DB_POOL_SIZE': args.db_threads,
+    })
+    with app.app_context():
+        db.session.execute(db.insert(Blog), [{'title': f'Post {i}', 'content': 'Body text. ' * 200,
+                                              'excerpt': f'Post {i}', 'category': 'News'}
+                                             for i in range(args.posts)])
+        db.session.execute(db.insert(User), [{'username': f'user{i}', 'email': f'user{i}@example.com'}
+                                             for i in range(args.users)])
+        db.session.commit()
+
+    if args.db_latency_ms:
+        def delay(*_):
+            time.sleep(args.db_latency_ms / 1000)
+        with app.app_context():
+            engines = list(db.engines.values())
+        if async_reader._engine is not None:
+            engines.append(async_reader._engine.sync_engine)
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', delay)
+    return app
+
+
+def request_paths(count, args):
+    return [PATHS[i % len(PATHS)].format(blog=i % args.posts + 1, user=i % args.users + 1) for i in range(count)]
+
+
+def run_sync(app, paths, threads):
+    def get(path):
+        start = time.perf_counter()
+        body, status, _ = run_wsgi_app(app, EnvironBuilder(path=path).get_environ(), buffered=True)
+        assert status.startswith('200'), (path, status)
+        return time.perf_counter() - start
+
+    begin = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        latencies = list(pool.map(get, paths))
+    return latencies, time.perf_counter() - begin
+
+
+async def run_async(adapter, paths, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def get(path):
+        async with semaphore:
+            start = time.perf_counter()
+            scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+            status = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            await adapter(scope, receive, send)
+            assert status == [200], (path, status)
+            return time.perf_counter() - start
+
+    begin = time.perf_counter()
+    latencies = await asyncio.gather(*(get(path) for path in paths))
+    return latencies, time.perf_counter() - begin
+
+
+def report(label, latencies, elapsed):
+    print(f'{label:<34}{len(latencies) / elapsed:>10,.0f} req/s   p50 {percentile(latencies, 50) * 1000:7.2f} ms'
+          f'   p95 {percentile(latencies, 95) * 1000:7.2f} ms   p99 {percentile(latencies, 99) * 1000:7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4, help='sync worker threads')
+    parser.add_argument('--concurrency', type=int, default=64, help='async requests in flight')
+    parser.add_argument('--db-threads', type=int, default=32, help='ASYNC_DB_THREADS and pool size')
+    parser.add_argument('--db-latency-ms', type=float, default=0.0)
+    parser.add_argument('--async-driver', choices=('auto', 'threadpool'), default='auto')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app(args)
+    paths = request_paths(args.requests, args)
+
+    report(f'sync ({args.threads} threads)', *run_sync(app, paths, args.threads))
+    adapter = ASGIAdapter(app, ASYNC_VIEWS)
+    report(f'async ({async_reader.driver}, {args.concurrency} in flight)',
+           *asyncio.run(run_async(adapter, paths, args.concurrency)))
+
+
+if __name__ == '__main__':
+    main()
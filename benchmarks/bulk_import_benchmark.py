@@ -0,0 +1,63 @@
+"""Rows/second for importing posts one request at a time versus the bulk path.
+
+    python benchmarks/bulk_import_benchmark.py --posts 20000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ADMIN  # noqa: E402
+from src.main import create_app  # noqa: E402
+
+
+def make_client():
+    tmp = tempfile.mkdtemp()
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+    client = app.test_client()
+    client.post('/api/admin/login', json=ADMIN)
+    return client
+
+
+def posts(count):
+    return [{'title': f'Legacy post {i}', 'content': 'Imported body text. ' * 100, 'excerpt': f'Post {i}',
+             'category': 'News', 'created_at': '2019-06-01T12:00:00'} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--single-posts', type=int, default=1000,
+                        help='posts to time through POST /api/admin/blogs (slow)')
+    args = parser.parse_args()
+
+    client = make_client()
+    items = posts(args.single_posts)
+    start = time.perf_counter()
+    for item in items:
+        client.post('/api/admin/blogs', json=item)
+    single = len(items) / (time.perf_counter() - start)
+
+    results = [('POST /api/admin/blogs (one per post)', single)]
+    items = posts(args.posts)
+    for label, content_type, body in (
+        ('POST /api/admin/blogs/bulk (JSON)', 'application/json', json.dumps(items)),
+        ('POST /api/admin/blogs/bulk (NDJSON)', 'application/x-ndjson', '\n'.join(map(json.dumps, items))),
+    ):
+        client = make_client()
+        start = time.perf_counter()
+        response = client.post('/api/admin/blogs/bulk', data=body, content_type=content_type)
+        elapsed = time.perf_counter() - start
+        assert response.get_json()['inserted'] == args.posts, response.get_json()
+        results.append((label, args.posts / elapsed))
+
+    for label, rate in results:
+        print(f'{label:<40}{rate:>12,.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
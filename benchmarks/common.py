@@ -0,0 +1,12 @@
+"""Helpers shared by the benchmark scripts (and the tests that reuse them)."""
+
+# The default admin account init_admin() creates
+ADMIN = {'email': 'admin@ay-group.net', 'password': 'AYGroup@2025'}
+
+
+# Nearest-rank percentile of samples; 0.0 when there are none.
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
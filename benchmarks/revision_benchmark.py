@@ -0,0 +1,109 @@
+"""Storage growth and reconstruction time of blog revisions over many edits.
+
+Edits one large post --edits times through PUT /api/admin/blogs/<id>, each
+edit rewriting a few random paragraphs, then compares the revision table's
+size with storing every version in full and times rebuilding versions. The
+post is laid out as paragraphs separated by blank lines and, separately, as
+one line (as HTML bodies often are); --layout picks one.
+
+    python benchmarks/revision_benchmark.py --edits 1000 --paragraphs 400
+    python benchmarks/revision_benchmark.py --snapshot-interval 50 --layout single-line
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ADMIN, percentile  # noqa: E402
+from src.main import create_app  # noqa: E402
+from src.models.revision import BlogRevision, load_revision  # noqa: E402
+from src.models.user import db  # noqa: E402
+
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore '
+         'et dolore magna aliqua').split()
+
+
+def sentence(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 20))).capitalize() + '.'
+
+
+def paragraph(rng):
+    return ' '.join(sentence(rng) for _ in range(rng.randint(3, 8)))
+
+
+LAYOUTS = {'paragraphs': '\n\n', 'single-line': ' '}
+
+
+def run(layout, args):
+    separator = LAYOUTS[layout]
+    rng = random.Random(1)
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, 'bench.db')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+                      'REVISION_SNAPSHOT_INTERVAL': args.snapshot_interval})
+    client = app.test_client()
+    client.post('/api/admin/login', json=ADMIN)
+
+    paragraphs = [paragraph(rng) for _ in range(args.paragraphs)]
+    blog_id = client.post('/api/admin/blogs', json={'title': 'Large post', 'content': separator.join(paragraphs)}
+                          ).get_json()['id']
+    db_size_before = os.path.getsize(path)
+
+    full_bytes = len(separator.join(paragraphs).encode())
+    write_times = []
+    for edit in range(args.edits):
+        for _ in range(args.changes_per_edit):
+            paragraphs[rng.randrange(len(paragraphs))] = paragraph(rng)
+        content = separator.join(paragraphs)
+        full_bytes += len(content.encode())
+        start = time.perf_counter()
+        response = client.put(f'/api/admin/blogs/{blog_id}', json={'title': f'Large post ({edit})',
+                                                                  'content': content})
+        write_times.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        stored, snapshots, count = db.session.execute(
+            db.select(db.func.sum(db.func.length(BlogRevision.data)),
+                      db.func.sum(db.case((BlogRevision.kind == 'snapshot', 1), else_=0)),
+                      db.func.count()).where(BlogRevision.blog_id == blog_id)).one()
+        numbers = rng.sample(range(1, count + 1), min(args.samples, count))
+        rebuild_times = []
+        for number in numbers:
+            start = time.perf_counter()
+            load_revision(blog_id, number)
+            rebuild_times.append(time.perf_counter() - start)
+            db.session.expunge_all()
+
+    print(f'-- {layout}')
+    print(f'revisions                {count:>12,} ({snapshots} snapshots, interval {args.snapshot_interval})')
+    print(f'post size                {len(content.encode()):>12,} bytes')
+    print(f'all versions in full     {full_bytes:>12,} bytes')
+    print(f'revision table data      {stored:>12,} bytes ({full_bytes / stored:,.0f}x smaller)')
+    print(f'database file growth     {os.path.getsize(path) - db_size_before:>12,} bytes')
+    print(f'PUT latency              p50 {percentile(write_times, 50) * 1000:8.2f} ms   '
+          f'p99 {percentile(write_times, 99) * 1000:8.2f} ms')
+    print(f'rebuild a version        p50 {percentile(rebuild_times, 50) * 1000:8.2f} ms   '
+          f'max {max(rebuild_times) * 1000:8.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--edits', type=int, default=1000)
+    parser.add_argument('--paragraphs', type=int, default=300, help='size of the post')
+    parser.add_argument('--changes-per-edit', type=int, default=3, help='paragraphs rewritten per edit')
+    parser.add_argument('--snapshot-interval', type=int, default=20)
+    parser.add_argument('--samples', type=int, default=200, help='versions to rebuild')
+    parser.add_argument('--layout', choices=[*LAYOUTS, 'both'], default='both')
+    args = parser.parse_args()
+
+    for layout in LAYOUTS if args.layout == 'both' else [args.layout]:
+        run(layout, args)
+
+
+if __name__ == '__main__':
+    main()
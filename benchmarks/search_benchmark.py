@@ -0,0 +1,85 @@
+"""Compare FTS5 search against a LIKE '%q%' scan over the blog table.
+
+    python benchmarks/search_benchmark.py --posts 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.search import FTS_SCHEMA, REBUILD_SQL, SEARCH_SQL, build_match_query  # noqa: E402
+
+WORDS = ('oman muscat software cloud platform enterprise design security data network '
+         'mobile strategy growth market customer product service digital energy logistics').split()
+
+LIKE_SQL = """
+    SELECT id, title FROM blog
+    WHERE published = 1 AND (title LIKE :pattern OR excerpt LIKE :pattern OR content LIKE :pattern)
+    ORDER BY created_at DESC
+    LIMIT :limit
+"""
+
+
+def seed(conn, posts, words_per_post):
+    conn.execute("""CREATE TABLE blog (
+        id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, content TEXT NOT NULL,
+        excerpt VARCHAR(500), author VARCHAR(100) NOT NULL, created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL, published BOOLEAN NOT NULL, category VARCHAR(100))""")
+    rng = random.Random(42)
+    rows = []
+    for i in range(posts):
+        body = ' '.join(rng.choice(WORDS) + str(rng.randint(0, 500)) for _ in range(words_per_post))
+        rows.append((f'Post {i} {rng.choice(WORDS)}', body, body[:120], 'AYGroup',
+                     f'2024-01-01 00:00:{i % 60:02d}', '2024-01-01 00:00:00', 1, 'News'))
+    conn.executemany('INSERT INTO blog (title, content, excerpt, author, created_at, updated_at, published, category) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--words', type=int, default=200, help='words per post body')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+        start = time.perf_counter()
+        seed(conn, args.posts, args.words)
+        print(f'seeded {args.posts} posts in {time.perf_counter() - start:.1f}s')
+
+        start = time.perf_counter()
+        for statement in FTS_SCHEMA:
+            conn.execute(statement)
+        conn.execute(REBUILD_SQL)
+        conn.commit()
+        print(f'built FTS index in {time.perf_counter() - start:.1f}s')
+
+        print(f"{'query':<16}{'fts5 ms':>10}{'like ms':>10}{'speedup':>10}")
+        for term in ('software42', 'muscat7 cloud7', 'secur* oman12', 'secur*'):
+            match = build_match_query(term)
+            pattern = '%' + term.split()[0].rstrip('*') + '%'
+            fts = timed(lambda: conn.execute(SEARCH_SQL, {'query': match, 'limit': 20, 'offset': 0}).fetchall(),
+                        args.repeat)
+            like = timed(lambda: conn.execute(LIKE_SQL, {'pattern': pattern, 'limit': 20}).fetchall(), args.repeat)
+            print(f'{term:<16}{fts:>10.2f}{like:>10.2f}{like / fts:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
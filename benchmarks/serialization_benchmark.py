@@ -0,0 +1,73 @@
+"""Throughput of blog listing serialization: ORM + to_dict() + stdlib jsonify
+versus Row tuples + RowSerializer + the app's JSON provider.
+
+    python benchmarks/serialization_benchmark.py --rows 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app  # noqa: E402
+from src.models.blog import Blog  # noqa: E402
+from src.models.user import db  # noqa: E402
+from src.utils.pagination import blog_columns  # noqa: E402
+from src.utils.serialization import RowSerializer, json_bytes  # noqa: E402
+
+
+def seed(rows):
+    base = datetime(2024, 1, 1)
+    db.session.execute(db.insert(Blog), [{
+        'title': f'Post {i}', 'content': 'lorem ipsum ' * 50, 'excerpt': f'Excerpt for post {i}',
+        'author': 'AYGroup', 'created_at': base + timedelta(minutes=i), 'updated_at': base + timedelta(minutes=i),
+        'published': True, 'category': 'News',
+    } for i in range(rows)])
+    db.session.commit()
+
+
+def orm_path(limit, fields):
+    blogs = Blog.query.filter_by(published=True).order_by(Blog.created_at.desc()).limit(limit).all()
+    return json.dumps([blog.to_dict(fields) for blog in blogs], sort_keys=True).encode()
+
+
+def row_path(limit, fields):
+    columns = blog_columns(fields)
+    statement = db.select(*columns).filter_by(published=True).order_by(Blog.created_at.desc()).limit(limit)
+    rows = db.session.execute(statement).all()
+    return json_bytes(RowSerializer(columns, fields)(rows))
+
+
+def rows_per_second(fn, limit, fields, repeat):
+    fn(limit, fields)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(limit, fields)
+        db.session.expunge_all()
+    return limit * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+    with app.app_context():
+        seed(max(args.rows))
+        backend = 'orjson' if app.json.use_orjson else 'stdlib'
+        print(f"{'rows':>8}{'orm rows/s':>14}{'row rows/s':>14}{'speedup':>10}   (JSON backend: {backend})")
+        for count in args.rows:
+            orm = rows_per_second(orm_path, count, Blog.SUMMARY_FIELDS, args.repeat)
+            fast = rows_per_second(row_path, count, Blog.SUMMARY_FIELDS, args.repeat)
+            print(f'{count:>8}{orm:>14,.0f}{fast:>14,.0f}{fast / orm:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
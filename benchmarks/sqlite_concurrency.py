@@ -0,0 +1,108 @@
+"""Stress SQLite with concurrent readers and a writer through the real app.
+
+Fails (exit status 1) if any request hits "database is locked" or the p99
+read latency exceeds --max-p99-ms.
+
+    python benchmarks/sqlite_concurrency.py --readers 16 --duration 10
+    python benchmarks/sqlite_concurrency.py --journal-mode DELETE   # baseline
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from benchmarks.common import ADMIN, percentile  # noqa: E402
+from src.main import create_app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds')
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--journal-mode', default='WAL')
+    parser.add_argument('--busy-timeout-ms', type=int, default=5000)
+    parser.add_argument('--max-p99-ms', type=float, default=250.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'stress.db')}",
+        'SQLITE_JOURNAL_MODE': args.journal_mode,
+        'SQLITE_BUSY_TIMEOUT_MS': args.busy_timeout_ms,
+        # Measure the database, not the response cache
+        'BLOG_CACHE_MAX_ENTRIES': 0,
+        'TESTING': True,
+    })
+
+    writer = app.test_client()
+    writer.post('/api/admin/login', json=ADMIN)
+    ids = [writer.post('/api/admin/blogs', json={'title': f'Post {i}', 'content': 'body ' * 200}).get_json()['id']
+           for i in range(args.posts)]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies, errors, writes = [], [], [0]
+
+    def record_error(exc):
+        with lock:
+            errors.append(repr(exc))
+
+    def read_loop(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        local = []
+        while not stop.is_set():
+            url = f'/api/blogs/{rng.choice(ids)}' if rng.random() < 0.7 else '/api/blogs?limit=20'
+            start = time.perf_counter()
+            try:
+                response = client.get(url)
+                if response.status_code >= 500:
+                    record_error(response.status_code)
+            except OperationalError as exc:
+                record_error(exc)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    def write_loop():
+        rng = random.Random(0)
+        while not stop.is_set():
+            try:
+                if rng.random() < 0.5:
+                    writer.post('/api/admin/blogs', json={'title': 'New', 'content': 'body ' * 200})
+                else:
+                    writer.put(f'/api/admin/blogs/{rng.choice(ids)}', json={'title': 'Edited', 'content': 'edited'})
+                writes[0] += 1
+            except OperationalError as exc:
+                record_error(exc)
+
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(args.readers)]
+    threads.append(threading.Thread(target=write_loop))
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    print(f'journal_mode={args.journal_mode} readers={args.readers} duration={args.duration}s')
+    print(f'reads={len(latencies)} writes={writes[0]} errors={len(errors)}')
+    print(f'read latency p50={p50:.2f}ms p99={p99:.2f}ms')
+    for error in errors[:5]:
+        print('  ', error)
+
+    if errors or p99 > args.max_p99_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Per-request cost of rendering the admin pages, before and after templates.
+
+    python benchmarks/template_benchmark.py --iterations 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, render_template, render_template_string, session  # noqa: E402
+
+from src.routes.admin import render_login_page  # noqa: E402
+from src.utils.static_assets import static_manifest  # noqa: E402
+
+SRC = os.path.join(ROOT, 'src')
+
+
+def per_call_us(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask('benchmark', root_path=SRC, static_folder=os.path.join(SRC, 'static'))
+    app.config['SECRET_KEY'] = 'benchmark'
+    static_manifest.init_app(app)
+
+    sources = {}
+    for name in ('login', 'dashboard'):
+        with open(os.path.join(SRC, 'templates', 'admin', f'{name}.html')) as fh:
+            sources[name] = fh.read()
+
+    with app.test_request_context('/api/admin/dashboard'):
+        session['admin_name'] = 'AYGroup'
+        # "before" re-parses and re-compiles the template source on every
+        # call, as render_template_string() did with the inline HTML.
+        results = [
+            ('login: render_template_string', per_call_us(lambda: render_template_string(sources['login']), args.iterations)),
+            ('login: render_template', per_call_us(lambda: render_template('admin/login.html'), args.iterations)),
+            ('login: precomputed', per_call_us(render_login_page, args.iterations)),
+            ('dashboard: render_template_string',
+             per_call_us(lambda: render_template_string(sources['dashboard']), args.iterations)),
+            ('dashboard: render_template', per_call_us(lambda: render_template('admin/dashboard.html'), args.iterations)),
+        ]
+
+    for label, micros in results:
+        print(f'{label:<36}{micros:>10.1f} us/request')
+
+
+if __name__ == '__main__':
+    main()
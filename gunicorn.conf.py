@@ -0,0 +1,33 @@
+# gunicorn -c gunicorn.conf.py
+#
+# Worker counts come from src.config.Config (WEB_WORKERS, WEB_THREADS, ...),
+# which reads them from the environment.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import Config  # noqa: E402
+
+wsgi_app = 'src.wsgi:app'
+bind = Config.BIND
+workers = Config.WEB_WORKERS
+threads = Config.WEB_THREADS
+worker_class = 'gthread'
+timeout = Config.WEB_TIMEOUT
+preload_app = True
+
+
+def on_starting(server):
+    if Config.METRICS_DIR:
+        from src.utils.metrics import clear_metrics_dir
+
+        clear_metrics_dir(Config.METRICS_DIR)
+
+
+def post_fork(server, worker):
+    from src.main import dispose_engines, start_job_workers
+    from src.wsgi import app
+
+    dispose_engines(app)
+    start_job_workers(app)
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from src.main import create_app, dispose_engines, init_database, start_job_workers
+from src.models.async_db import async_reader
+from src.routes.async_public import ASYNC_VIEWS
+from src.utils.asgi_bridge import ASGIAdapter
+from src.utils.jobs import job_queue
+from src.utils.scheduler import publish_scheduler
+
+# ASGI entry point, e.g.
+#
+#   uvicorn src.asgi:app --workers 4
+#   gunicorn src.asgi:app -k uvicorn.workers.UvicornWorker
+#
+# The public read endpoints run as coroutines on async_reader; all other
+# routes go through the Flask app in a thread pool. Startup work happens at
+# import, as in src/wsgi.py; per-process resources are (re)opened on the
+# lifespan startup event, which servers send after forking.
+flask_app = create_app({'INIT_DATABASE': False})
+init_database(flask_app)
+dispose_engines(flask_app)
+
+
+async def startup():
+    dispose_engines(flask_app)
+    await async_reader.dispose()
+    start_job_workers(flask_app)
+
+
+async def shutdown():
+    await asyncio.to_thread(job_queue.stop, 5)
+    await asyncio.to_thread(publish_scheduler.stop, 5)
+    await async_reader.dispose()
+
+
+app = ASGIAdapter(flask_app, ASYNC_VIEWS, threads=flask_app.config['ASGI_WSGI_THREADS'],
+                  on_startup=[startup], on_shutdown=[shutdown])
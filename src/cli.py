@@ -0,0 +1,94 @@
+import json
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from src.models.search import rebuild_search_index
+from src.utils.bulk import backfill_metadata, import_blogs, iter_ndjson
+from src.utils.jobs import job_queue
+from src.utils.prerender import site_builder
+from src.utils.scheduler import publish_due
+
+blogs_cli = AppGroup('blogs', help='Blog maintenance commands.')
+
+
+@blogs_cli.command('reindex')
+def reindex_command():
+    """Rebuild the full-text search index from the blog table."""
+    if rebuild_search_index():
+        click.echo('Search index rebuilt.')
+    else:
+        click.echo('Full-text search requires SQLite; nothing to do.')
+
+
+@blogs_cli.command('build')
+@click.option('--full', is_flag=True, help='Rewrite every file instead of only changed ones.')
+def build_command(full):
+    """Pre-render published posts and index pages into PRERENDER_DIR."""
+    builder = site_builder()
+    if builder is None:
+        raise click.ClickException('PRERENDER_DIR is not set.')
+    start = time.perf_counter()
+    stats = builder.build(full=full)
+    click.echo(f"Wrote {stats['posts_written']} posts and {stats['pages_written']} index pages, removed "
+               f"{stats['posts_removed'] + stats['pages_removed']} files in {time.perf_counter() - start:.2f}s "
+               f"({builder.output_dir}).")
+
+
+@blogs_cli.command('backfill')
+@click.option('--all', 'everything', is_flag=True, help='Recompute every post, not only ones missing metadata.')
+@click.option('--batch-size', type=int, default=None, help='Rows per transaction (default: BULK_BATCH_SIZE).')
+def backfill_command(everything, batch_size):
+    """Compute excerpts, word counts, reading times and content hashes."""
+    start = time.perf_counter()
+    count = backfill_metadata(batch_size or current_app.config['BULK_BATCH_SIZE'], everything)
+    click.echo(f'Updated {count} posts in {time.perf_counter() - start:.2f}s.')
+
+
+@blogs_cli.command('run-jobs')
+def run_jobs_command():
+    """Run due background jobs in this process, then exit."""
+    count = job_queue.run_pending()
+    counts = job_queue.counts()
+    click.echo(f"Ran {count} jobs; {counts['pending']} pending, {counts['failed']} failed.")
+
+
+@blogs_cli.command('publish-due')
+def publish_due_command():
+    """Publish scheduled posts that are due, for setups without workers."""
+    published = publish_due()
+    click.echo(f'Published {len(published)} scheduled posts.')
+
+
+@blogs_cli.command('import')
+@click.argument('source', type=click.File('r', encoding='utf-8'))
+@click.option('--author', default='AYGroup', show_default=True, help='Author for posts that do not name one.')
+@click.option('--batch-size', type=int, default=None, help='Rows per transaction (default: BULK_BATCH_SIZE).')
+def import_command(source, author, batch_size):
+    """Import posts from a JSON array or NDJSON file ('-' for stdin)."""
+    first = source.read(1)
+    while first.isspace():
+        first = source.read(1)
+    if first == '[':
+        items = json.loads(first + source.read())
+    else:
+        items = iter_ndjson(_prepend(first, source))
+
+    start = time.perf_counter()
+    result = import_blogs(items, author, batch_size or current_app.config['BULK_BATCH_SIZE'])
+    elapsed = time.perf_counter() - start
+
+    rate = result['inserted'] / elapsed if elapsed else 0
+    click.echo(f"Imported {result['inserted']} posts in {elapsed:.2f}s ({rate:,.0f} rows/s).")
+    for error in result['errors'][:20]:
+        click.echo(f"  item {error['index']}: {error['error']}", err=True)
+    if len(result['errors']) > 20:
+        click.echo(f"  ... and {len(result['errors']) - 20} more errors", err=True)
+
+
+def _prepend(first, lines):
+    head = next(lines, '')
+    yield first + head
+    yield from lines
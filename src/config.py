@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+
+BASE_DIR = os.path.dirname(__file__)
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Defaults for create_app(). Every key can be overridden from the environment
+# or by passing a mapping to create_app(config).
+class Config:
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'asdf#FGSgvasgf$5$WGT')
+
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        'DATABASE_URL', f"sqlite:///{os.path.join(BASE_DIR, 'database', 'app.db')}")
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Optional read replica (any SQLAlchemy URL, e.g. postgresql://...).
+    # Public read endpoints use it; writes always go to the primary.
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+
+    # Connection pool, applied to the primary and the replica
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 20)
+    DB_POOL_TIMEOUT = env_int('DB_POOL_TIMEOUT', 10)
+    DB_POOL_RECYCLE = env_int('DB_POOL_RECYCLE', 1800)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', '1') != '0'
+
+    # SQLite connection pragmas (src/models/engine.py). WAL lets readers run
+    # while an admin write is in progress; writers wait up to the busy
+    # timeout instead of failing with "database is locked".
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = env_int('SQLITE_BUSY_TIMEOUT_MS', 5000)
+    SQLITE_CACHE_SIZE_KIB = env_int('SQLITE_CACHE_SIZE_KIB', 16 * 1024)
+    SQLITE_MMAP_SIZE = env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
+
+    # Run db.create_all(), migrations and init_admin() inside create_app().
+    # The WSGI entry point turns this off and does it once before forking.
+    INIT_DATABASE = True
+
+    # Admin login. Stored hashes made with other parameters are upgraded on
+    # the next successful login. Attempts are limited per client IP and per
+    # account with token buckets (burst size, refill per minute).
+    ADMIN_PASSWORD_METHOD = os.environ.get('ADMIN_PASSWORD_METHOD', 'scrypt')
+    LOGIN_IP_BURST = env_int('LOGIN_IP_BURST', 20)
+    LOGIN_IP_PER_MINUTE = env_int('LOGIN_IP_PER_MINUTE', 10)
+    LOGIN_ACCOUNT_BURST = env_int('LOGIN_ACCOUNT_BURST', 5)
+    LOGIN_ACCOUNT_PER_MINUTE = env_int('LOGIN_ACCOUNT_PER_MINUTE', 2)
+    ADMIN_IDENTITY_CACHE_TTL = env_int('ADMIN_IDENTITY_CACHE_TTL', 60)
+
+    # 'auto' uses orjson when installed, 'stdlib' forces the json module
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+    # Rows per transaction for bulk imports
+    BULK_BATCH_SIZE = env_int('BULK_BATCH_SIZE', 500)
+
+    # Rows fetched and serialized per chunk by streaming responses
+    STREAM_CHUNK_ROWS = env_int('STREAM_CHUNK_ROWS', 500)
+
+    # Static JSON copies of the public read API (see src/utils/prerender.py).
+    # Unset disables pre-rendering; a relative path is taken from the working
+    # directory. PRERENDER_SERVE also serves the files from /prerendered/
+    # instead of leaving that to a front proxy.
+    PRERENDER_DIR = os.environ.get('PRERENDER_DIR') or None
+    PRERENDER_PAGE_SIZE = env_int('PRERENDER_PAGE_SIZE', 20)
+    PRERENDER_SERVE = os.environ.get('PRERENDER_SERVE', '0') != '0'
+
+    # Blog revisions: a full copy every this many revisions, diffs between
+    REVISION_SNAPSHOT_INTERVAL = env_int('REVISION_SNAPSHOT_INTERVAL', 20)
+
+    # Scheduled publishing (src/utils/scheduler.py): besides waking for due
+    # times written by this process, the scheduler re-reads the next due
+    # time from the database this often to see other processes' schedules
+    PUBLISH_SCHEDULER_REFRESH_SECONDS = env_int('PUBLISH_SCHEDULER_REFRESH_SECONDS', 60)
+
+    # /api/admin/blogs/changes event streams: how often they poll for changes
+    # and how long one stream stays open before the client reconnects
+    CHANGES_POLL_SECONDS = float(os.environ.get('CHANGES_POLL_SECONDS', 1))
+    CHANGES_STREAM_SECONDS = env_int('CHANGES_STREAM_SECONDS', 300)
+
+    # Background jobs (src/utils/jobs.py): worker threads per process, retry
+    # policy with exponential backoff, and how long a running job may go
+    # without finishing before another worker takes it over.
+    JOB_WORKERS = env_int('JOB_WORKERS', 2)
+    JOB_MAX_ATTEMPTS = env_int('JOB_MAX_ATTEMPTS', 5)
+    JOB_BACKOFF_SECONDS = env_int('JOB_BACKOFF_SECONDS', 2)
+    JOB_POLL_SECONDS = env_int('JOB_POLL_SECONDS', 2)
+    JOB_LEASE_SECONDS = env_int('JOB_LEASE_SECONDS', 300)
+    JOB_RETENTION_HOURS = env_int('JOB_RETENTION_HOURS', 168)
+
+    # Request/SQL instrumentation and the /api/metrics route. Debug mode
+    # also instruments requests and adds Server-Timing headers.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '0') != '0'
+    # Counts are kept per process, so with several workers each scrape of
+    # /api/metrics only sees the worker that answered it. Set METRICS_DIR to
+    # a directory shared by the workers (e.g. under /run) to serve the sum
+    # over all of them; each worker writes its counts there at most every
+    # METRICS_FLUSH_SECONDS.
+    METRICS_DIR = os.environ.get('METRICS_DIR') or None
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 1))
+    METRICS_SLOW_QUERY_MS = env_int('METRICS_SLOW_QUERY_MS', 100)
+    # Log when one statement runs this many times within a single request
+    METRICS_N_PLUS_ONE_THRESHOLD = env_int('METRICS_N_PLUS_ONE_THRESHOLD', 10)
+
+    # Compiled template cache. Unset uses Jinja's per-user directory under
+    # the system temp dir, which it creates 0700 and checks the owner of; a
+    # directory set here must not be writable by other users.
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR') or None
+
+    # ASGI entry point (src/asgi.py): 'auto' uses an asyncio driver such as
+    # aiosqlite when installed, 'threadpool' always runs queries on
+    # ASYNC_DB_THREADS threads. Non-async routes share ASGI_WSGI_THREADS.
+    ASYNC_DB_DRIVER = os.environ.get('ASYNC_DB_DRIVER', 'auto')
+    ASYNC_DB_THREADS = env_int('ASYNC_DB_THREADS', 16)
+    ASGI_WSGI_THREADS = env_int('ASGI_WSGI_THREADS', 16)
+
+    # Worker model for the production server (see gunicorn.conf.py)
+    BIND = os.environ.get('BIND', '0.0.0.0:5000')
+    WEB_WORKERS = env_int('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+    WEB_THREADS = env_int('WEB_THREADS', 4)
+    WEB_TIMEOUT = env_int('WEB_TIMEOUT', 30)
@@ -3,47 +3,129 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask, current_app, send_from_directory
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.serving import is_running_from_reloader
 from flask_cors import CORS
+from src.config import Config
 from src.models.user import db
 from src.models.blog import Blog, Admin
+from src.models.async_db import async_reader
+from src.models.engine import configure_database, configure_engines
+from src.models.migrations import run_migrations
+from src.cli import blogs_cli
 from src.routes.user import user_bp
 from src.routes.admin import admin_bp, init_admin
+from src.utils.auth import admin_identity_cache, login_limiter
+from src.utils.cache import blog_cache
+from src.utils.jobs import job_queue
+from src.utils.metrics import metrics
+from src.utils.prerender import URL_PREFIX as PRERENDER_PREFIX
+from src.utils.scheduler import publish_scheduler
+from src.utils.serialization import FastJSONProvider
+from src.utils.static_assets import static_manifest
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
-# Enable CORS for all routes
-CORS(app, supports_credentials=True)
+def create_app(config=None):
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    app.json = FastJSONProvider(app)
+    # Resolved once so the builder (relative to the working directory) and
+    # send_from_directory (relative to app.root_path) use the same directory
+    if app.config['PRERENDER_DIR']:
+        app.config['PRERENDER_DIR'] = os.path.abspath(app.config['PRERENDER_DIR'])
 
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(admin_bp, url_prefix='/api')
+    # Compiled templates are kept in memory per process; the bytecode cache
+    # lets new workers skip compiling them again.
+    # Jinja executes the files it finds there, so the directory must be
+    # private to this user.
+    cache_dir = app.config['JINJA_BYTECODE_CACHE_DIR']
+    if cache_dir:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(cache_dir)}
 
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+    # Enable CORS for all routes
+    CORS(app, supports_credentials=True)
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api')
+
+    configure_database(app)
+    db.init_app(app)
+    configure_engines(app)
+    async_reader.init_app(app)
+    blog_cache.init_app(app)
+    admin_identity_cache.init_app(app)
+    login_limiter.init_app(app)
+    static_manifest.init_app(app)
+    metrics.init_app(app)
+    job_queue.init_app(app)
+    publish_scheduler.init_app(app)
+    app.cli.add_command(blogs_cli)
+
+    app.add_url_rule('/', 'serve', serve, defaults={'path': ''})
+    app.add_url_rule('/<path:path>', 'serve', serve)
+
+    if app.config['INIT_DATABASE']:
+        init_database(app)
+    return app
+
+
+# One-off startup work. Under a pre-forking server this runs once in the
+# master, before any worker exists.
+def init_database(app):
+    with app.app_context():
+        # Primary only: a replica gets its schema through replication, and the
+        # replica bind is not configured in every app in the process
+        db.create_all(bind_key=None)
+        run_migrations()
+        init_admin()  # Initialize default admin user
+
+
+# Connections must never be shared across a fork. Call in each worker right
+# after forking so it opens its own.
+def dispose_engines(app):
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+# Background job worker threads and the publish scheduler. Like
+# dispose_engines, call this in each worker process after forking; threads
+# do not survive a fork.
+def start_job_workers(app):
+    job_queue.start(app)
+    publish_scheduler.start(app)
 
-with app.app_context():
-    db.create_all()
-    init_admin()  # Initialize default admin user
 
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    if current_app.static_folder is None:
             return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    prerendered = current_app.config['PRERENDER_DIR'] if current_app.config['PRERENDER_SERVE'] else None
+    if prerendered and path.startswith(f'{PRERENDER_PREFIX}/'):
+        response = send_from_directory(prerendered, path[len(PRERENDER_PREFIX) + 1:], max_age=0)
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+        return response
+
+    asset = static_manifest.lookup(path) if path != "" else None
+    if asset is not None:
+        return static_manifest.response(asset)
+
+    # Unknown paths with a file extension are missing assets; everything else
+    # is a client-side route and gets the app shell.
+    if '.' in path.rsplit('/', 1)[-1]:
+        return "File not found", 404
+    if static_manifest.index is None:
+        return "index.html not found", 404
+    return static_manifest.response(static_manifest.index)
 
 
 if __name__ == '__main__':
+    app = create_app()
+    if is_running_from_reloader():
+        start_job_workers(app)
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,87 @@
+import asyncio
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from src.models.engine import pool_options, sqlite_connect_listener
+from src.models.routing import REPLICA_BIND
+from src.models.user import db
+
+# asyncio DBAPI driver per backend, used when it is installed
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+
+def async_url(url):
+    url = make_url(url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None or importlib.util.find_spec(driver) is None:
+        return None
+    return url.set(drivername=f'{backend}+{driver}')
+
+
+# Read-only query runner for the async views. Uses an SQLAlchemy asyncio
+# engine when the backend's async driver is installed (ASYNC_DB_DRIVER
+# 'auto'), and otherwise runs the statements on the regular sync engine in
+# a bounded thread pool, so awaiting a query never blocks the event loop.
+# Reads go to the replica when one is configured.
+class AsyncReader:
+    def __init__(self):
+        self.driver = None
+        self._engine = None
+        self._sync_engine = None
+        self._executor = None
+        self._threads = 16
+
+    def init_app(self, app):
+        config = app.config
+        url = config.get('DATABASE_REPLICA_URL') or config['SQLALCHEMY_DATABASE_URI']
+        self._threads = config['ASYNC_DB_THREADS']
+        self._engine = None
+        target = async_url(url) if config['ASYNC_DB_DRIVER'] == 'auto' else None
+        if target is not None:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            self._engine = create_async_engine(target, **pool_options(url, config))
+            if target.get_backend_name() == 'sqlite':
+                event.listen(self._engine.sync_engine, 'connect', sqlite_connect_listener(config))
+            self.driver = target.drivername
+        else:
+            with app.app_context():
+                self._sync_engine = db.engines.get(REPLICA_BIND) or db.engine
+            self.driver = 'threadpool'
+
+    def _run_sync(self, statement, first):
+        with self._sync_engine.connect() as conn:
+            result = conn.execute(statement)
+            return result.first() if first else result.all()
+
+    async def _execute(self, statement, first):
+        if self._engine is not None:
+            async with self._engine.connect() as conn:
+                result = await conn.execute(statement)
+                return result.first() if first else result.all()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._threads, thread_name_prefix='async-db')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._run_sync, statement, first)
+
+    async def fetch(self, statement):
+        return await self._execute(statement, first=False)
+
+    async def fetch_one(self, statement):
+        return await self._execute(statement, first=True)
+
+    # Drop pooled connections and threads; call in each process after fork.
+    async def dispose(self):
+        if self._engine is not None:
+            await self._engine.dispose()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+async_reader = AsyncReader()
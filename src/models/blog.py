@@ -4,26 +4,46 @@ from src.models.user import db
 class Blog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    # Deferred so listings never read post bodies unless a caller asks for them
+    content = db.deferred(db.Column(db.Text, nullable=False))
     excerpt = db.Column(db.String(500), nullable=True)
     author = db.Column(db.String(100), nullable=False, default='AYGroup')
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     published = db.Column(db.Boolean, nullable=False, default=True)
+    # Unpublished posts with a publish_at are scheduled; src/utils/scheduler.py
+    # publishes them when it comes due
+    publish_at = db.Column(db.DateTime, nullable=True)
     category = db.Column(db.String(100), nullable=True)
+    # Derived from content on every write (src/utils/content.py)
+    word_count = db.Column(db.Integer, nullable=True)
+    reading_time = db.Column(db.Integer, nullable=True)
+    content_hash = db.Column(db.String(64), nullable=True)
+
+    # Keep these in step with src/models/migrations.py so existing databases
+    # get the same indexes as freshly created ones.
+    __table_args__ = (
+        db.Index('ix_blog_published_created_at', published, created_at.desc(), id.desc()),
+        db.Index('ix_blog_created_at', created_at.desc(), id.desc()),
+        db.Index('ix_blog_category', category),
+        db.Index('ix_blog_published_updated_at', published, updated_at),
+        db.Index('ix_blog_published_category_created_at', published, category, created_at.desc(), id.desc()),
+        db.Index('ix_blog_published_author_created_at', published, author, created_at.desc(), id.desc()),
+        db.Index('ix_blog_published_publish_at', published, publish_at),
+    )
     
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'content': self.content,
-            'excerpt': self.excerpt,
-            'author': self.author,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'published': self.published,
-            'category': self.category
-        }
+    FIELDS = ('id', 'title', 'content', 'excerpt', 'author', 'created_at', 'updated_at', 'published', 'publish_at',
+              'category', 'word_count', 'reading_time')
+    SUMMARY_FIELDS = tuple(field for field in FIELDS if field != 'content')
+    
+    def to_dict(self, fields=None):
+        data = {}
+        for field in fields or self.FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            data[field] = value
+        return data
 
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -0,0 +1,107 @@
+from datetime import datetime
+
+from src.models.blog import Blog
+from src.models.user import db
+from src.utils.pagination import blog_columns
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+
+
+# Change log behind /api/blogs/changes. seq comes from an AUTOINCREMENT key,
+# so it only ever grows, even across deletes. Each post keeps only its most
+# recent row: writing a post moves it to the head of the log, and deleting
+# it leaves a tombstone. The log therefore stays one row per post ever
+# written, and a client that passes the last seq it saw gets each changed
+# post once. public marks posts that have been published at some point;
+# the public feed leaves out the others, so draft ids never appear in it.
+class BlogChange(db.Model):
+    __tablename__ = 'blog_change'
+
+    seq = db.Column(db.Integer, primary_key=True)
+    blog_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    public = db.Column(db.Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        db.Index('ix_blog_change_blog_id', blog_id),
+        {'sqlite_autoincrement': True},
+    )
+
+
+# Log a change for each blog id in the caller's transaction, before a
+# deleted post's row is removed.
+def record_changes(blog_ids, op, session=None):
+    session = session or db.session
+    blog_ids = list(blog_ids)
+    if not blog_ids:
+        return
+    now = datetime.utcnow()
+    for start in range(0, len(blog_ids), 500):
+        chunk = blog_ids[start:start + 500]
+        public = set(session.execute(db.select(BlogChange.blog_id).where(
+            BlogChange.blog_id.in_(chunk), BlogChange.public)).scalars())
+        public.update(session.execute(db.select(Blog.id).where(Blog.id.in_(chunk), Blog.published)).scalars())
+        session.execute(db.delete(BlogChange).where(BlogChange.blog_id.in_(chunk)))
+        session.execute(db.insert(BlogChange), [{'blog_id': blog_id, 'op': op, 'changed_at': now,
+                                                 'public': blog_id in public} for blog_id in chunk])
+
+
+def create_change_log(conn):
+    BlogChange.__table__.create(conn, checkfirst=True)
+    if conn.execute(db.select(db.func.count()).select_from(BlogChange)).scalar():
+        return
+    # Start the log with every existing post so since=0 means "everything"
+    conn.execute(db.insert(BlogChange).from_select(
+        ['blog_id', 'op', 'changed_at', 'public'],
+        db.select(Blog.id, db.literal(UPSERT), Blog.updated_at, Blog.published).order_by(Blog.updated_at, Blog.id)))
+
+
+# Position of the newest change. It moves on every committed blog write in
+# any process, which makes it the version of cached listings and facets.
+def head_seq_query():
+    return db.select(db.func.max(BlogChange.seq))
+
+
+def head_seq():
+    return db.session.execute(head_seq_query()).scalar() or 0
+
+
+# Time of the newest change, a Last-Modified that deletes also move.
+def head_changed_at_query():
+    return db.select(BlogChange.changed_at).order_by(BlogChange.seq.desc()).limit(1)
+
+
+# Position of a post's latest change (its only row in the log), the version
+# of its cached detail response; writes to other posts leave it alone.
+def blog_seq_query(blog_id):
+    return db.select(BlogChange.seq).where(BlogChange.blog_id == blog_id)
+
+
+# Changes after seq `since`, oldest first, at most `limit`. Returns
+# (changes, next_since, has_more). Without drafts, posts that were never
+# published are left out and one that is not published any more is
+# reported as deleted.
+def changes_since(since, limit, include_drafts=False):
+    columns = blog_columns(Blog.SUMMARY_FIELDS)
+    statement = (db.select(BlogChange.seq, BlogChange.blog_id, BlogChange.op, *columns)
+                 .outerjoin(Blog, Blog.id == BlogChange.blog_id)
+                 .where(BlogChange.seq > since).order_by(BlogChange.seq).limit(limit + 1))
+    if not include_drafts:
+        statement = statement.where(BlogChange.public)
+    rows = db.session.execute(statement).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changes = []
+    for row in rows:
+        visible = row.op == UPSERT and row.id is not None and (include_drafts or row.published)
+        blog = None
+        if visible:
+            blog = {field: getattr(row, field) for field in Blog.SUMMARY_FIELDS}
+            for field, value in blog.items():
+                if isinstance(value, datetime):
+                    blog[field] = value.isoformat()
+        changes.append({'seq': row.seq, 'id': row.blog_id, 'op': UPSERT if visible else DELETE, 'blog': blog})
+    return changes, rows[-1].seq if rows else since, has_more
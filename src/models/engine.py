@@ -0,0 +1,68 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from src.models.routing import REPLICA_BIND
+from src.models.user import db
+
+
+def pool_options(url, config):
+    options = {
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+    }
+    url = make_url(url)
+    # In-memory SQLite uses a single static connection, not a sized pool
+    if not (url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')):
+        options.update(
+            pool_size=config['DB_POOL_SIZE'],
+            max_overflow=config['DB_MAX_OVERFLOW'],
+            pool_timeout=config['DB_POOL_TIMEOUT'],
+        )
+    return options
+
+
+# Derive engine options and the replica bind from app config. Call before
+# db.init_app(); explicit SQLALCHEMY_ENGINE_OPTIONS/SQLALCHEMY_BINDS win.
+def configure_database(app):
+    config = app.config
+    config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', pool_options(config['SQLALCHEMY_DATABASE_URI'], config))
+    replica_url = config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault(REPLICA_BIND, {'url': replica_url, **pool_options(replica_url, config)})
+        config['SQLALCHEMY_BINDS'] = binds
+
+
+def sqlite_pragmas(config):
+    return [
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('busy_timeout', int(config['SQLITE_BUSY_TIMEOUT_MS'])),
+        # Negative cache_size is in KiB rather than pages
+        ('cache_size', -int(config['SQLITE_CACHE_SIZE_KIB'])),
+        ('mmap_size', int(config['SQLITE_MMAP_SIZE'])),
+        ('temp_store', 'MEMORY'),
+    ]
+
+
+# 'connect' event listener applying the SQLite pragmas from config.
+def sqlite_connect_listener(config):
+    pragmas = sqlite_pragmas(config)
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+    return on_connect
+
+
+# Apply the SQLite pragmas from app config to every new DB-API connection of
+# every engine (the default bind and any extra binds).
+def configure_engines(app):
+    on_connect = sqlite_connect_listener(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', on_connect)
@@ -0,0 +1,68 @@
+from collections import Counter
+
+from src.models.blog import Blog
+from src.models.user import db
+
+FACET_KINDS = ('category', 'author', 'month')
+
+
+# Published post counts per category, author and creation month, kept up to
+# date by the write paths (apply_facet_delta in the same transaction as the
+# write) so navigation never has to GROUP BY over the blog table.
+class BlogFacet(db.Model):
+    __tablename__ = 'blog_facet'
+
+    kind = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+def facet_keys(category, author, created_at):
+    keys = [('category', category), ('author', author), ('month', created_at.strftime('%Y-%m'))]
+    return [key for key in keys if key[1]]
+
+
+# Add the facets of each (category, author, created_at) row to delta with
+# the given sign: +1 for posts becoming visible, -1 for posts leaving.
+def facet_delta(rows, sign=1, delta=None):
+    delta = Counter() if delta is None else delta
+    for category, author, created_at in rows:
+        for key in facet_keys(category, author, created_at):
+            delta[key] += sign
+    return delta
+
+
+def apply_facet_delta(delta, session=None):
+    session = session or db.session
+    for (kind, value), change in delta.items():
+        if not change:
+            continue
+        updated = session.execute(
+            db.update(BlogFacet).where(BlogFacet.kind == kind, BlogFacet.value == value)
+            .values(count=BlogFacet.count + change)).rowcount
+        if not updated:
+            session.execute(db.insert(BlogFacet).values(kind=kind, value=value, count=change))
+
+
+# Recount every facet from the blog table; used once by the migration that
+# introduces the table and available for repairs.
+def rebuild_facets(conn):
+    BlogFacet.__table__.create(conn, checkfirst=True)
+    conn.execute(db.delete(BlogFacet))
+    delta = Counter()
+    rows = conn.execution_options(yield_per=1000).execute(
+        db.select(Blog.category, Blog.author, Blog.created_at).where(Blog.published))
+    facet_delta(rows, delta=delta)
+    if delta:
+        conn.execute(db.insert(BlogFacet), [{'kind': kind, 'value': value, 'count': count}
+                                           for (kind, value), count in delta.items()])
+
+
+def blog_facets():
+    facets = {kind: [] for kind in FACET_KINDS}
+    rows = db.session.execute(db.select(BlogFacet.kind, BlogFacet.value, BlogFacet.count)
+                              .where(BlogFacet.count > 0).order_by(BlogFacet.kind, BlogFacet.value))
+    for kind, value, count in rows:
+        facets[kind].append({'value': value, 'count': count})
+    facets['month'].reverse()  # newest month first
+    return facets
@@ -0,0 +1,91 @@
+from sqlalchemy import inspect, text
+from src.models.user import db
+from src.models.changes import create_change_log
+from src.models.facets import rebuild_facets
+from src.models.job import create_job_table
+from src.models.revision import create_revision_table
+from src.models.search import create_search_index
+
+
+# Step that adds a column unless it already exists (db.create_all() builds
+# new databases with it).
+def add_column(table, column, ddl):
+    def step(conn):
+        columns = {col['name'] for col in inspect(conn).get_columns(table)}
+        if column not in columns:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    return step
+
+
+# Ordered list of (version, description, steps). A step is either a SQL
+# string or a callable taking the connection. Steps must be safe to run on a
+# database that db.create_all() has just built, because fresh databases start
+# at version 0 and replay every migration.
+MIGRATIONS = [
+    (1, 'Blog listing and category indexes', [
+        'CREATE INDEX IF NOT EXISTS ix_blog_published_created_at ON blog (published, created_at DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS ix_blog_created_at ON blog (created_at DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS ix_blog_category ON blog (category)',
+    ]),
+    (2, 'Blog conditional GET validator index', [
+        'CREATE INDEX IF NOT EXISTS ix_blog_published_updated_at ON blog (published, updated_at)',
+    ]),
+    (3, 'Blog full-text search index (SQLite FTS5)', [
+        create_search_index,
+    ]),
+    (4, 'Blog facet counts and filtered listing indexes', [
+        'CREATE INDEX IF NOT EXISTS ix_blog_published_category_created_at '
+        'ON blog (published, category, created_at DESC, id DESC)',
+        'CREATE INDEX IF NOT EXISTS ix_blog_published_author_created_at '
+        'ON blog (published, author, created_at DESC, id DESC)',
+        rebuild_facets,
+    ]),
+    (5, 'Background job table', [
+        create_job_table,
+    ]),
+    (6, 'Blog change log', [
+        create_change_log,
+    ]),
+    (7, 'Blog reading metadata columns (fill with `flask blogs backfill`)', [
+        add_column('blog', 'word_count', 'INTEGER'),
+        add_column('blog', 'reading_time', 'INTEGER'),
+        add_column('blog', 'content_hash', 'VARCHAR(64)'),
+    ]),
+    (8, 'Blog revision history', [
+        create_revision_table,
+    ]),
+    (9, 'Scheduled publishing', [
+        add_column('blog', 'publish_at', 'DATETIME'),
+        'CREATE INDEX IF NOT EXISTS ix_blog_published_publish_at ON blog (published, publish_at)',
+    ]),
+    (10, 'Keep never-published drafts out of the public change feed', [
+        add_column('blog_change', 'public', 'BOOLEAN NOT NULL DEFAULT 0'),
+        # Earlier history is unknown; only current drafts count as never published
+        "UPDATE blog_change SET public = 1 "
+        "WHERE op = 'delete' OR blog_id NOT IN (SELECT id FROM blog WHERE published = 0)",
+    ]),
+]
+
+
+def current_version(conn):
+    conn.execute(text('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)'))
+    return conn.execute(text('SELECT MAX(version) FROM schema_version')).scalar() or 0
+
+
+# Apply pending migrations, each in its own transaction.
+def run_migrations():
+    with db.engine.begin() as conn:
+        version = current_version(conn)
+
+    for target, _, steps in MIGRATIONS:
+        if target <= version:
+            continue
+        with db.engine.begin() as conn:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+            conn.execute(text('INSERT INTO schema_version (version) VALUES (:version)'), {'version': target})
+        version = target
+    return version
@@ -0,0 +1,180 @@
+import difflib
+import json
+import re
+import zlib
+from datetime import datetime
+
+from src.models.user import db
+from src.utils.content import content_hash
+
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+
+
+# One row per saved version of a post. The small fields are stored as they
+# are; content is zlib-compressed, either in full (a snapshot) or as a diff
+# against the previous revision (a delta). A snapshot is written every
+# REVISION_SNAPSHOT_INTERVAL revisions, and whenever the delta would not be
+# smaller, so rebuilding any version applies a bounded number of deltas.
+class BlogRevision(db.Model):
+    __tablename__ = 'blog_revision'
+
+    id = db.Column(db.Integer, primary_key=True)
+    blog_id = db.Column(db.Integer, nullable=False)
+    number = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(10), nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    content_length = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    excerpt = db.Column(db.String(500), nullable=True)
+    category = db.Column(db.String(100), nullable=True)
+    published = db.Column(db.Boolean, nullable=False)
+    author = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint(blog_id, number, name='uq_blog_revision_blog_id_number'),
+    )
+
+    SUMMARY_FIELDS = ('number', 'kind', 'title', 'published', 'author', 'created_at', 'content_length')
+
+    def to_dict(self, content=None):
+        data = {field: getattr(self, field) for field in self.SUMMARY_FIELDS}
+        data['created_at'] = self.created_at.isoformat()
+        data['stored_bytes'] = len(self.data)
+        if content is not None:
+            data.update(excerpt=self.excerpt, category=self.category, content=content)
+        return data
+
+
+def create_revision_table(conn):
+    BlogRevision.__table__.create(conn, checkfirst=True)
+
+
+# Diff units: text up to each line break, sentence end or tag end, so
+# bodies without newlines (e.g. HTML on one line) still diff in small
+# pieces. The cuts come from the content, so units line up again right after
+# an edit. Longer units are cut at the first space past MAX_UNIT_LENGTH.
+MAX_UNIT_LENGTH = 200
+UNIT = re.compile(r'[^\n.!?>]*(?:[.!?](?!\s)[^\n.!?>]*)*(?:\n|[.!?]\s+|>)|.+', re.S)
+
+
+def _cut(unit):
+    start = 0
+    while len(unit) - start > MAX_UNIT_LENGTH:
+        cut = unit.find(' ', start + MAX_UNIT_LENGTH)
+        if cut < 0:
+            break
+        yield unit[start:cut + 1]
+        start = cut + 1
+    if start < len(unit):
+        yield unit[start:]
+
+
+def split_units(text):
+    units = []
+    for unit in UNIT.findall(text):
+        if len(unit) > MAX_UNIT_LENGTH:
+            units.extend(_cut(unit))
+        else:
+            units.append(unit)
+    return units
+
+
+# Delta format: JSON {"ops": [...]} where each op is [start, end] (copy
+# those units of the previous version) or a string (insert this text, which
+# is itself whole units). Deltas written before split_units() existed are a
+# bare list of ops over splitlines() units.
+def make_delta(old, new):
+    old_units = split_units(old)
+    new_units = split_units(new)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_units, new_units, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(''.join(new_units[j1:j2]))
+    return json.dumps({'ops': ops}, separators=(',', ':')).encode()
+
+
+# Apply a delta to the previous version given as its units; returns the new
+# version's units, so a chain of deltas only splits inserted text.
+def apply_delta_units(old_units, delta):
+    delta = json.loads(delta)
+    if isinstance(delta, list):
+        old_units = ''.join(old_units).splitlines(keepends=True)
+        return split_units(''.join(''.join(old_units[op[0]:op[1]]) if isinstance(op, list) else op
+                                   for op in delta))
+    units = []
+    for op in delta['ops']:
+        units.extend(old_units[op[0]:op[1]] if isinstance(op, list) else split_units(op))
+    return units
+
+
+def apply_delta(old, delta):
+    return ''.join(apply_delta_units(split_units(old), delta))
+
+
+# Save the post's current state as its next revision, in the caller's
+# transaction. previous_content is the body of the latest revision (the
+# post's content before this write).
+def record_revision(blog, author, previous_content=None, snapshot_interval=20):
+    latest = db.session.execute(
+        db.select(db.func.max(BlogRevision.number),
+                  db.func.max(db.case((BlogRevision.kind == SNAPSHOT, BlogRevision.number), else_=None)))
+        .where(BlogRevision.blog_id == blog.id)).one()
+    number = (latest[0] or 0) + 1
+    full = zlib.compress(blog.content.encode('utf-8'))
+    kind, data = SNAPSHOT, full
+    if latest[0] is not None and previous_content is not None and number - latest[1] < snapshot_interval:
+        delta = zlib.compress(make_delta(previous_content, blog.content))
+        if len(delta) < len(full):
+            kind, data = DELTA, delta
+
+    revision = BlogRevision(blog_id=blog.id, number=number, kind=kind, data=data,
+                            content_hash=content_hash(blog.content), content_length=len(blog.content),
+                            title=blog.title, excerpt=blog.excerpt, category=blog.category,
+                            published=blog.published, author=author)
+    db.session.add(revision)
+    return revision
+
+
+def has_revisions(blog_id):
+    return db.session.execute(db.select(BlogRevision.id).filter_by(blog_id=blog_id).limit(1)).first() is not None
+
+
+def list_revisions(blog_id):
+    return BlogRevision.query.filter_by(blog_id=blog_id).order_by(BlogRevision.number.desc()).all()
+
+
+# Rebuild revision `number` of a post: its nearest snapshot plus the deltas
+# after it. Returns (revision, content), or (None, None) if there is no such
+# revision.
+def load_revision(blog_id, number):
+    revision = BlogRevision.query.filter_by(blog_id=blog_id, number=number).first()
+    if revision is None:
+        return None, None
+    base = db.session.execute(
+        db.select(db.func.max(BlogRevision.number))
+        .where(BlogRevision.blog_id == blog_id, BlogRevision.kind == SNAPSHOT,
+               BlogRevision.number <= number)).scalar()
+    chain = db.session.execute(
+        db.select(BlogRevision.kind, BlogRevision.data)
+        .where(BlogRevision.blog_id == blog_id, BlogRevision.number.between(base, number))
+        .order_by(BlogRevision.number)).all()
+    units = None
+    for kind, data in chain:
+        data = zlib.decompress(data)
+        units = split_units(data.decode('utf-8')) if kind == SNAPSHOT else apply_delta_units(units, data)
+    content = ''.join(units)
+    if content_hash(content) != revision.content_hash:
+        raise ValueError(f'Revision {number} of blog {blog_id} does not match its content hash')
+    return revision, content
+
+
+def delete_revisions(blog_ids):
+    blog_ids = list(blog_ids)
+    for start in range(0, len(blog_ids), 500):
+        db.session.execute(db.delete(BlogRevision).where(BlogRevision.blog_id.in_(blog_ids[start:start + 500])))
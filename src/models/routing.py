@@ -0,0 +1,52 @@
+import contextlib
+import functools
+
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND = 'replica'
+
+
+# Session that sends reads to the replica bind while a @replica_read view is
+# running. Flushes and INSERT/UPDATE/DELETE statements always go to the
+# primary, and without a configured replica everything does.
+class RoutingSession(Session):
+    use_replica = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.use_replica and not self._flushing and not isinstance(clause, UpdateBase):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Send this session's reads to the replica (or, with use_replica=False, the
+# primary) inside the block, restoring the previous routing afterwards.
+@contextlib.contextmanager
+def read_from_replica(use_replica=True):
+    session = current_app.extensions['sqlalchemy'].session()
+    previous, session.use_replica = session.use_replica, use_replica
+    try:
+        yield session
+    finally:
+        session.use_replica = previous
+
+
+# Whether reads are currently routed to the replica, so work deferred past
+# the view (e.g. a streamed response body) can route its reads the same way.
+def reading_from_replica():
+    return current_app.extensions['sqlalchemy'].session().use_replica
+
+
+# Route the view's queries to the read replica. Replication lag means a read
+# right after an admin write may be stale; cached responses built from it
+# expire after BLOG_CACHE_TTL. Streamed responses run after the view
+# returns; the helpers in src.utils.streaming carry the routing over.
+def replica_read(f):
+    @functools.wraps(f)
+    def decorated_function(*args, **kwargs):
+        with read_from_replica():
+            return f(*args, **kwargs)
+    return decorated_function
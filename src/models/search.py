@@ -0,0 +1,83 @@
+import re
+
+from sqlalchemy import text
+from src.models.user import db
+
+# blog_fts is an external-content FTS5 index over blog: it stores only the
+# token index and reads column values back from blog by rowid. The triggers
+# keep it in sync for every write path, including bulk Core statements.
+FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS blog_fts USING fts5(
+        title, excerpt, content,
+        content='blog', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS blog_fts_ai AFTER INSERT ON blog BEGIN
+        INSERT INTO blog_fts (rowid, title, excerpt, content)
+        VALUES (new.id, new.title, new.excerpt, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_fts_ad AFTER DELETE ON blog BEGIN
+        INSERT INTO blog_fts (blog_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS blog_fts_au AFTER UPDATE OF title, excerpt, content ON blog BEGIN
+        INSERT INTO blog_fts (blog_fts, rowid, title, excerpt, content)
+        VALUES ('delete', old.id, old.title, old.excerpt, old.content);
+        INSERT INTO blog_fts (rowid, title, excerpt, content)
+        VALUES (new.id, new.title, new.excerpt, new.content);
+    END""",
+]
+
+REBUILD_SQL = "INSERT INTO blog_fts (blog_fts) VALUES ('rebuild')"
+
+# bm25 weights are per column (title, excerpt, content); lower rank is better.
+SEARCH_SQL = """
+    SELECT blog.id, blog.title, blog.excerpt, blog.author, blog.created_at, blog.category,
+           snippet(blog_fts, -1, '<mark>', '</mark>', '...', 16) AS snippet,
+           bm25(blog_fts, 10.0, 5.0, 1.0) AS rank
+    FROM blog_fts JOIN blog ON blog.id = blog_fts.rowid
+    WHERE blog_fts MATCH :query AND blog.published = 1
+    ORDER BY rank, blog.id
+    LIMIT :limit OFFSET :offset
+"""
+
+_TERM = re.compile(r'(\w+)(\*?)', re.UNICODE)
+
+
+def search_available(bind):
+    return bind.dialect.name == 'sqlite'
+
+
+def create_search_index(conn):
+    if not search_available(conn):
+        return
+    for statement in FTS_SCHEMA:
+        conn.execute(text(statement))
+    conn.execute(text(REBUILD_SQL))
+
+
+# Rebuild the whole index from the blog table, e.g. after restoring a backup
+# or importing rows with triggers disabled.
+def rebuild_search_index():
+    with db.engine.begin() as conn:
+        if not search_available(conn):
+            return False
+        for statement in FTS_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text(REBUILD_SQL))
+    return True
+
+
+# Turn free text into an FTS5 query: every word must match, quoted so user
+# input can never be parsed as FTS syntax; a trailing * makes a word a prefix.
+def build_match_query(raw):
+    terms = []
+    for word, star in _TERM.findall(raw or ''):
+        terms.append(f'"{word}"' + ('*' if star else ''))
+    return ' '.join(terms)
+
+
+def search_blogs(query, limit, offset=0):
+    statement = text(SEARCH_SQL).columns(created_at=db.DateTime)
+    rows = db.session.execute(statement, {'query': query, 'limit': limit, 'offset': offset})
+    return rows.mappings().all()
@@ -1,12 +1,15 @@
 from flask_sqlalchemy import SQLAlchemy
+from src.models.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
 
+    FIELDS = ('id', 'username', 'email')
+
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -1,26 +1,87 @@
-from flask import Blueprint, request, jsonify, session, render_template_string
-from werkzeug.security import check_password_hash, generate_password_hash
+from flask import Blueprint, Response, abort, current_app, request, jsonify, render_template
+from werkzeug.security import generate_password_hash
 from src.models.user import db
 from src.models.blog import Blog, Admin
+from src.models.changes import (DELETE, UPSERT, blog_seq_query, changes_since, head_changed_at_query, head_seq,
+                                head_seq_query, record_changes)
+from src.models.facets import apply_facet_delta, blog_facets, facet_delta
+from src.models.job import Job
+from src.models.revision import delete_revisions, has_revisions, list_revisions, load_revision, record_revision
+from src.models.routing import replica_read
+from src.models.search import build_match_query, search_available, search_blogs
+from src.utils.auth import (admin_identity_cache, authenticate, client_ip, current_admin, end_session,
+                            login_limiter, login_required, start_session, too_many_attempts)
+from src.utils.bulk import (BulkItemError, delete_blogs, import_blogs, iter_lines, iter_ndjson, parse_ids,
+                            set_published)
+from src.utils.cache import blog_cache
+from src.utils.conditional import conditional_response, is_not_modified, make_etag, not_modified_response
+from src.utils.content import content_hash, content_metadata, make_excerpt
+from src.utils.jobs import job_queue
+from src.utils.pagination import (InvalidPageRequest, blog_columns, page_args, page_span, paginate_blogs, parse_fields,
+                                  parse_filters, parse_limit, parse_offset)
+from src.utils.prerender import schedule_rebuild
+from src.utils.scheduler import parse_publish_at, publish_due_first, publish_scheduler, publish_state
+from src.utils.serialization import RowSerializer, json_bytes
+from src.utils.streaming import stream_events, stream_json_array, stream_ndjson, wants_event_stream, wants_stream
 from datetime import datetime
 import functools
+import hashlib
 
 admin_bp = Blueprint('admin', __name__)
 
-# Admin login required decorator
-def login_required(f):
-    @functools.wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'admin_id' not in session:
-            return jsonify({'error': 'Authentication required'}), 401
-        return f(*args, **kwargs)
-    return decorated_function
+def cached_json_response(entry):
+    if is_not_modified(entry.etag, entry.last_modified):
+        return not_modified_response(entry.etag, entry.last_modified)
+    return conditional_response(entry.body, entry.etag, entry.last_modified)
+
+# Validators for the public listing come from one aggregate over the
+# (published, updated_at) index plus the change log head. max(updated_at)
+# and the row count alone miss some writes, e.g. a delete followed by an
+# import that keeps an old updated_at; the head moves on every write.
+def listing_validator_query(filters):
+    return db.select(db.func.max(Blog.updated_at), db.func.count(), head_seq_query().scalar_subquery(),
+                     head_changed_at_query().scalar_subquery()).select_from(Blog).filter_by(
+        published=True, **filters)
+
+def listing_etag(key, row):
+    last_modified, count, seq, changed_at = row
+    if changed_at is not None and (last_modified is None or changed_at > last_modified):
+        last_modified = changed_at
+    return make_etag('blogs', seq, last_modified, count, *key[1:]), last_modified
+
+def listing_validators(key, filters):
+    return listing_etag(key, db.session.execute(listing_validator_query(filters)).one())
+
+def blog_validator_query(blog_id):
+    return db.select(Blog.updated_at).filter_by(id=blog_id, published=True)
+
+def blog_validators(blog_id):
+    updated_at = db.session.execute(blog_validator_query(blog_id)).scalar()
+    if updated_at is None:
+        return None, None
+    return make_etag('blog', blog_id, updated_at), updated_at
+
+# Drop cached public responses that a write to one blog can change. Listing
+# pages only depend on the post if it was or is published. Filtered pages
+# are dropped by span too, which may include pages of other categories.
+# This only reaches the current process; other processes notice the write
+# through the change log position their entries are versioned with.
+def invalidate_blog_cache(blog_id, created_at, published):
+    blog_cache.invalidate(('blog', blog_id))
+    if published:
+        blog_cache.invalidate_listings((created_at, blog_id))
+        blog_cache.invalidate(('facets',))
+
+# Work after a committed blog write runs on the job queue so it does not
+# add to the admin request's latency.
+def after_blog_write(blog_id=None):
+    schedule_rebuild()
 
 # Initialize default admin user
 def init_admin():
     admin = Admin.query.filter_by(email='admin@ay-group.net').first()
     if not admin:
-        hashed_password = generate_password_hash('AYGroup@2025')
+        hashed_password = generate_password_hash('AYGroup@2025', method=current_app.config['ADMIN_PASSWORD_METHOD'])
         new_admin = Admin(
             email='admin@ay-group.net',
             password=hashed_password,
@@ -29,206 +90,47 @@ def init_admin():
         db.session.add(new_admin)
         db.session.commit()
 
+# The login page has no per-request content, so it is rendered once per
+# process and served from memory
+@functools.lru_cache(maxsize=1)
+def render_login_page():
+    body = render_template('admin/login.html').encode()
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
 # Admin login page
 @admin_bp.route('/admin')
 def admin_login_page():
-    return render_template_string('''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AY Group Admin Panel</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #121111 0%, #444444 50%, #121111 100%);
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: #c4c4c4;
-        }
-        
-        .login-container {
-            background: rgba(68, 68, 68, 0.3);
-            backdrop-filter: blur(10px);
-            border: 2px solid #bc9e24;
-            border-radius: 15px;
-            padding: 40px;
-            width: 400px;
-            box-shadow: 0 0 30px rgba(188, 158, 36, 0.3);
-        }
-        
-        .logo {
-            text-align: center;
-            margin-bottom: 30px;
-        }
-        
-        .logo h1 {
-            color: #bc9e24;
-            font-size: 2.5em;
-            font-weight: bold;
-            text-shadow: 0 0 20px rgba(188, 158, 36, 0.5);
-        }
-        
-        .logo p {
-            color: #d6c78b;
-            margin-top: 10px;
-            font-size: 0.9em;
-            letter-spacing: 2px;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 8px;
-            color: #c4c4c4;
-            font-weight: 500;
-        }
-        
-        input[type="email"], input[type="password"] {
-            width: 100%;
-            padding: 12px;
-            background: rgba(68, 68, 68, 0.5);
-            border: 1px solid #575757;
-            border-radius: 8px;
-            color: #c4c4c4;
-            font-size: 16px;
-            transition: all 0.3s ease;
-        }
-        
-        input[type="email"]:focus, input[type="password"]:focus {
-            outline: none;
-            border-color: #bc9e24;
-            box-shadow: 0 0 10px rgba(188, 158, 36, 0.3);
-        }
-        
-        .login-btn {
-            width: 100%;
-            padding: 12px;
-            background: linear-gradient(45deg, #bc9e24, #d6c78b);
-            border: none;
-            border-radius: 8px;
-            color: #121111;
-            font-size: 16px;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
-        
-        .login-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(188, 158, 36, 0.4);
-        }
-        
-        .error {
-            color: #ff4444;
-            text-align: center;
-            margin-top: 15px;
-            display: none;
-        }
-        
-        .success {
-            color: #44ff44;
-            text-align: center;
-            margin-top: 15px;
-            display: none;
-        }
-    </style>
-</head>
-<body>
-    <div class="login-container">
-        <div class="logo">
-            <h1>AY GROUP</h1>
-            <p>ADMIN PANEL</p>
-        </div>
-        
-        <form id="loginForm">
-            <div class="form-group">
-                <label for="email">Email:</label>
-                <input type="email" id="email" name="email" required>
-            </div>
-            
-            <div class="form-group">
-                <label for="password">Password:</label>
-                <input type="password" id="password" name="password" required>
-            </div>
-            
-            <button type="submit" class="login-btn">LOGIN</button>
-            
-            <div id="error" class="error"></div>
-            <div id="success" class="success"></div>
-        </form>
-    </div>
-    
-    <script>
-        document.getElementById('loginForm').addEventListener('submit', async (e) => {
-            e.preventDefault();
-            
-            const email = document.getElementById('email').value;
-            const password = document.getElementById('password').value;
-            const errorDiv = document.getElementById('error');
-            const successDiv = document.getElementById('success');
-            
-            try {
-                const response = await fetch('/api/admin/login', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ email, password })
-                });
-                
-                const data = await response.json();
-                
-                if (response.ok) {
-                    successDiv.textContent = 'Login successful! Redirecting...';
-                    successDiv.style.display = 'block';
-                    errorDiv.style.display = 'none';
-                    setTimeout(() => {
-                        window.location.href = '/api/admin/dashboard';
-                    }, 1000);
-                } else {
-                    errorDiv.textContent = data.error || 'Login failed';
-                    errorDiv.style.display = 'block';
-                    successDiv.style.display = 'none';
-                }
-            } catch (error) {
-                errorDiv.textContent = 'Network error. Please try again.';
-                errorDiv.style.display = 'block';
-                successDiv.style.display = 'none';
-            }
-        });
-    </script>
-</body>
-</html>
-    ''')
+    body, etag = render_login_page()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
 
 # Admin login API
 @admin_bp.route('/admin/login', methods=['POST'])
 def admin_login():
     data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Email and password required'}), 400
     email = data.get('email')
     password = data.get('password')
     
     if not email or not password:
         return jsonify({'error': 'Email and password required'}), 400
+    if not isinstance(email, str) or not isinstance(password, str):
+        return jsonify({'error': 'Email and password must be strings'}), 400
+    
+    wait = login_limiter.check(client_ip(), email)
+    if wait:
+        return too_many_attempts(wait)
     
-    admin = Admin.query.filter_by(email=email).first()
+    admin = authenticate(email, password, current_app.config['ADMIN_PASSWORD_METHOD'])
     
-    if admin and check_password_hash(admin.password, password):
-        session['admin_id'] = admin.id
-        session['admin_name'] = admin.name
+    if admin:
+        start_session(admin)
         return jsonify({'message': 'Login successful', 'admin': admin.to_dict()}), 200
     else:
         return jsonify({'error': 'Invalid credentials'}), 401
@@ -237,454 +139,42 @@ def admin_login():
 @admin_bp.route('/admin/logout', methods=['POST'])
 @login_required
 def admin_logout():
-    session.clear()
+    end_session()
     return jsonify({'message': 'Logged out successfully'}), 200
 
 # Admin dashboard
 @admin_bp.route('/admin/dashboard')
 @login_required
 def admin_dashboard():
-    return render_template_string('''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AY Group Admin Dashboard</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #121111 0%, #444444 50%, #121111 100%);
-            min-height: 100vh;
-            color: #c4c4c4;
-        }
-        
-        .header {
-            background: rgba(68, 68, 68, 0.3);
-            backdrop-filter: blur(10px);
-            border-bottom: 2px solid #bc9e24;
-            padding: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .logo h1 {
-            color: #bc9e24;
-            font-size: 1.8em;
-            text-shadow: 0 0 10px rgba(188, 158, 36, 0.5);
-        }
-        
-        .user-info {
-            display: flex;
-            align-items: center;
-            gap: 20px;
-        }
-        
-        .logout-btn {
-            padding: 8px 16px;
-            background: linear-gradient(45deg, #bc9e24, #d6c78b);
-            border: none;
-            border-radius: 5px;
-            color: #121111;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }
-        
-        .logout-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 3px 10px rgba(188, 158, 36, 0.4);
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 30px 20px;
-        }
-        
-        .dashboard-grid {
-            display: grid;
-            grid-template-columns: 1fr 2fr;
-            gap: 30px;
-            margin-bottom: 30px;
-        }
-        
-        .card {
-            background: rgba(68, 68, 68, 0.3);
-            backdrop-filter: blur(10px);
-            border: 1px solid #575757;
-            border-radius: 10px;
-            padding: 20px;
-        }
-        
-        .card h2 {
-            color: #bc9e24;
-            margin-bottom: 20px;
-            text-shadow: 0 0 5px rgba(188, 158, 36, 0.3);
-        }
-        
-        .form-group {
-            margin-bottom: 15px;
-        }
-        
-        label {
-            display: block;
-            margin-bottom: 5px;
-            color: #c4c4c4;
-            font-weight: 500;
-        }
-        
-        input, textarea, select {
-            width: 100%;
-            padding: 10px;
-            background: rgba(68, 68, 68, 0.5);
-            border: 1px solid #575757;
-            border-radius: 5px;
-            color: #c4c4c4;
-            font-size: 14px;
-        }
-        
-        input:focus, textarea:focus, select:focus {
-            outline: none;
-            border-color: #bc9e24;
-            box-shadow: 0 0 5px rgba(188, 158, 36, 0.3);
-        }
-        
-        textarea {
-            min-height: 120px;
-            resize: vertical;
-        }
-        
-        .btn {
-            padding: 10px 20px;
-            background: linear-gradient(45deg, #bc9e24, #d6c78b);
-            border: none;
-            border-radius: 5px;
-            color: #121111;
-            font-weight: bold;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            margin-right: 10px;
-        }
-        
-        .btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 3px 10px rgba(188, 158, 36, 0.4);
-        }
-        
-        .btn-danger {
-            background: linear-gradient(45deg, #ff4444, #ff6666);
-        }
-        
-        .blog-list {
-            max-height: 400px;
-            overflow-y: auto;
-        }
-        
-        .blog-item {
-            background: rgba(87, 87, 87, 0.3);
-            border: 1px solid #575757;
-            border-radius: 8px;
-            padding: 15px;
-            margin-bottom: 15px;
-            transition: all 0.3s ease;
-        }
-        
-        .blog-item:hover {
-            border-color: #bc9e24;
-            transform: translateY(-2px);
-        }
-        
-        .blog-title {
-            color: #bc9e24;
-            font-size: 1.1em;
-            font-weight: bold;
-            margin-bottom: 5px;
-        }
-        
-        .blog-meta {
-            color: #969696;
-            font-size: 0.9em;
-            margin-bottom: 10px;
-        }
-        
-        .blog-excerpt {
-            color: #c4c4c4;
-            font-size: 0.95em;
-            line-height: 1.4;
-            margin-bottom: 10px;
-        }
-        
-        .blog-actions {
-            display: flex;
-            gap: 10px;
-        }
-        
-        .btn-small {
-            padding: 5px 10px;
-            font-size: 0.8em;
-        }
-        
-        .message {
-            padding: 10px;
-            border-radius: 5px;
-            margin-bottom: 15px;
-            display: none;
-        }
-        
-        .message.success {
-            background: rgba(68, 255, 68, 0.1);
-            border: 1px solid #44ff44;
-            color: #44ff44;
-        }
-        
-        .message.error {
-            background: rgba(255, 68, 68, 0.1);
-            border: 1px solid #ff4444;
-            color: #ff4444;
-        }
-        
-        @media (max-width: 768px) {
-            .dashboard-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="logo">
-            <h1>AY GROUP ADMIN</h1>
-        </div>
-        <div class="user-info">
-            <span>Welcome, {{ session.admin_name }}</span>
-            <button class="logout-btn" onclick="logout()">Logout</button>
-        </div>
-    </div>
-    
-    <div class="container">
-        <div id="message" class="message"></div>
-        
-        <div class="dashboard-grid">
-            <div class="card">
-                <h2>Create New Blog Post</h2>
-                <form id="blogForm">
-                    <input type="hidden" id="blogId" name="blogId">
-                    
-                    <div class="form-group">
-                        <label for="title">Title:</label>
-                        <input type="text" id="title" name="title" required>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="excerpt">Excerpt:</label>
-                        <textarea id="excerpt" name="excerpt" placeholder="Brief description..."></textarea>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="category">Category:</label>
-                        <select id="category" name="category">
-                            <option value="">Select Category</option>
-                            <option value="Technology">Technology</option>
-                            <option value="Business">Business</option>
-                            <option value="Innovation">Innovation</option>
-                            <option value="News">News</option>
-                        </select>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="content">Content:</label>
-                        <textarea id="content" name="content" required placeholder="Write your blog content here..."></textarea>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label>
-                            <input type="checkbox" id="published" name="published" checked>
-                            Published
-                        </label>
-                    </div>
-                    
-                    <button type="submit" class="btn" id="submitBtn">Create Post</button>
-                    <button type="button" class="btn btn-danger" onclick="resetForm()" id="cancelBtn" style="display: none;">Cancel</button>
-                </form>
-            </div>
-            
-            <div class="card">
-                <h2>Blog Posts</h2>
-                <div id="blogList" class="blog-list">
-                    <!-- Blog posts will be loaded here -->
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        let editingBlogId = null;
-        
-        // Load blogs on page load
-        document.addEventListener('DOMContentLoaded', function() {
-            loadBlogs();
-        });
-        
-        // Blog form submission
-        document.getElementById('blogForm').addEventListener('submit', async (e) => {
-            e.preventDefault();
-            
-            const formData = new FormData(e.target);
-            const blogData = {
-                title: formData.get('title'),
-                excerpt: formData.get('excerpt'),
-                category: formData.get('category'),
-                content: formData.get('content'),
-                published: formData.get('published') === 'on'
-            };
-            
-            try {
-                let response;
-                if (editingBlogId) {
-                    response = await fetch(`/api/admin/blogs/${editingBlogId}`, {
-                        method: 'PUT',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(blogData)
-                    });
-                } else {
-                    response = await fetch('/api/admin/blogs', {
-                        method: 'POST',
-                        headers: { 'Content-Type': 'application/json' },
-                        body: JSON.stringify(blogData)
-                    });
-                }
-                
-                const result = await response.json();
-                
-                if (response.ok) {
-                    showMessage(editingBlogId ? 'Blog updated successfully!' : 'Blog created successfully!', 'success');
-                    resetForm();
-                    loadBlogs();
-                } else {
-                    showMessage(result.error || 'Operation failed', 'error');
-                }
-            } catch (error) {
-                showMessage('Network error. Please try again.', 'error');
-            }
-        });
-        
-        async function loadBlogs() {
-            try {
-                const response = await fetch('/api/admin/blogs');
-                const blogs = await response.json();
-                
-                const blogList = document.getElementById('blogList');
-                blogList.innerHTML = '';
-                
-                blogs.forEach(blog => {
-                    const blogItem = document.createElement('div');
-                    blogItem.className = 'blog-item';
-                    blogItem.innerHTML = `
-                        <div class="blog-title">${blog.title}</div>
-                        <div class="blog-meta">
-                            By ${blog.author} | ${new Date(blog.created_at).toLocaleDateString()} | ${blog.category || 'Uncategorized'}
-                            ${blog.published ? '<span style="color: #44ff44;">Published</span>' : '<span style="color: #ff4444;">Draft</span>'}
-                        </div>
-                        <div class="blog-excerpt">${blog.excerpt || blog.content.substring(0, 150) + '...'}</div>
-                        <div class="blog-actions">
-                            <button class="btn btn-small" onclick="editBlog(${blog.id})">Edit</button>
-                            <button class="btn btn-danger btn-small" onclick="deleteBlog(${blog.id})">Delete</button>
-                        </div>
-                    `;
-                    blogList.appendChild(blogItem);
-                });
-            } catch (error) {
-                showMessage('Failed to load blogs', 'error');
-            }
-        }
-        
-        async function editBlog(id) {
-            try {
-                const response = await fetch(`/api/admin/blogs/${id}`);
-                const blog = await response.json();
-                
-                document.getElementById('blogId').value = blog.id;
-                document.getElementById('title').value = blog.title;
-                document.getElementById('excerpt').value = blog.excerpt || '';
-                document.getElementById('category').value = blog.category || '';
-                document.getElementById('content').value = blog.content;
-                document.getElementById('published').checked = blog.published;
-                
-                document.getElementById('submitBtn').textContent = 'Update Post';
-                document.getElementById('cancelBtn').style.display = 'inline-block';
-                
-                editingBlogId = id;
-            } catch (error) {
-                showMessage('Failed to load blog for editing', 'error');
-            }
-        }
-        
-        async function deleteBlog(id) {
-            if (confirm('Are you sure you want to delete this blog post?')) {
-                try {
-                    const response = await fetch(`/api/admin/blogs/${id}`, {
-                        method: 'DELETE'
-                    });
-                    
-                    if (response.ok) {
-                        showMessage('Blog deleted successfully!', 'success');
-                        loadBlogs();
-                    } else {
-                        const result = await response.json();
-                        showMessage(result.error || 'Delete failed', 'error');
-                    }
-                } catch (error) {
-                    showMessage('Network error. Please try again.', 'error');
-                }
-            }
-        }
-        
-        function resetForm() {
-            document.getElementById('blogForm').reset();
-            document.getElementById('blogId').value = '';
-            document.getElementById('submitBtn').textContent = 'Create Post';
-            document.getElementById('cancelBtn').style.display = 'none';
-            editingBlogId = null;
-        }
-        
-        function showMessage(text, type) {
-            const message = document.getElementById('message');
-            message.textContent = text;
-            message.className = `message ${type}`;
-            message.style.display = 'block';
-            
-            setTimeout(() => {
-                message.style.display = 'none';
-            }, 5000);
-        }
-        
-        async function logout() {
-            try {
-                await fetch('/api/admin/logout', { method: 'POST' });
-                window.location.href = '/api/admin';
-            } catch (error) {
-                console.error('Logout failed:', error);
-            }
-        }
-    </script>
-</body>
-</html>
-    ''')
+    return render_template('admin/dashboard.html')
 
 # Get all blogs (admin)
 @admin_bp.route('/admin/blogs', methods=['GET'])
 @login_required
 def get_blogs():
-    blogs = Blog.query.order_by(Blog.created_at.desc()).all()
-    return jsonify([blog.to_dict() for blog in blogs]), 200
+    try:
+        limit, cursor = page_args(request.args)
+        fields = parse_fields(request.args.get('fields'))
+        columns = blog_columns(fields)
+        if wants_stream(request.args):
+            statement = db.select(*columns).order_by(Blog.created_at.desc(), Blog.id.desc())
+            return stream_json_array(statement, RowSerializer(columns, fields))
+        rows, next_cursor = paginate_blogs(db.select(*columns), limit, cursor)
+    except InvalidPageRequest as exc:
+        return jsonify({'error': str(exc)}), 400
+    return jsonify({'blogs': RowSerializer(columns, fields)(rows), 'next_cursor': next_cursor}), 200
+
+# Export all blogs as newline-delimited JSON (admin)
+@admin_bp.route('/admin/blogs/export', methods=['GET'])
+@login_required
+def export_blogs():
+    try:
+        fields = parse_fields(request.args.get('fields') or 'full')
+    except InvalidPageRequest as exc:
+        return jsonify({'error': str(exc)}), 400
+    columns = blog_columns(fields)
+    statement = db.select(*columns).order_by(Blog.id)
+    return stream_ndjson(statement, RowSerializer(columns, fields), filename='blogs.ndjson')
 
 # Get single blog (admin)
 @admin_bp.route('/admin/blogs/<int:blog_id>', methods=['GET'])
@@ -701,22 +191,85 @@ def create_blog():
     
     if not data.get('title') or not data.get('content'):
         return jsonify({'error': 'Title and content are required'}), 400
+    try:
+        published, publish_at = publish_state(data.get('published', True), parse_publish_at(data.get('publish_at')))
+    except ValueError:
+        return jsonify({'error': 'publish_at must be an ISO 8601 timestamp'}), 400
     
     blog = Blog(
         title=data['title'],
         content=data['content'],
-        excerpt=data.get('excerpt', ''),
-        author=session.get('admin_name', 'AYGroup'),
-        published=data.get('published', True),
-        category=data.get('category', '')
+        excerpt=data.get('excerpt') or make_excerpt(data['content']),
+        author=current_admin()['name'],
+        published=published,
+        publish_at=publish_at,
+        category=data.get('category', ''),
+        **content_metadata(data['content'])
     )
     
     db.session.add(blog)
+    db.session.flush()
+    if blog.published:
+        apply_facet_delta(facet_delta([(blog.category, blog.author, blog.created_at)]))
+    record_changes([blog.id], UPSERT)
+    record_revision(blog, blog.author, snapshot_interval=current_app.config['REVISION_SNAPSHOT_INTERVAL'])
     db.session.commit()
+    invalidate_blog_cache(blog.id, blog.created_at, blog.published)
+    after_blog_write(blog.id)
+    if not blog.published:
+        publish_scheduler.schedule(blog.publish_at)
     
     return jsonify(blog.to_dict()), 201
 
-# Update blog
+# Apply an edit to blog and commit it together with its facet counts, change
+# log entry and revision. Rows are only rewritten when something changed,
+# and content (with the search index) only when its hash differs. Returns
+# False, without writing, for an edit that changes nothing.
+def apply_blog_update(blog, title, content, excerpt, published, category, publish_at):
+    published, publish_at = publish_state(published, publish_at)
+    content_changed = content_hash(content) != blog.content_hash
+    excerpt = excerpt or ''
+    # An excerpt generated from the old body is regenerated with the new one
+    if not excerpt or (content_changed and excerpt == blog.excerpt and excerpt == make_excerpt(blog.content)):
+        excerpt = make_excerpt(content)
+    if not content_changed and (blog.title, blog.excerpt, blog.published, blog.category, blog.publish_at) == (
+            title, excerpt, published, category, publish_at):
+        return False
+    
+    snapshot_interval = current_app.config['REVISION_SNAPSHOT_INTERVAL']
+    previous_content = blog.content
+    # Posts imported in bulk or written before revisions existed get their
+    # current state saved first
+    if not has_revisions(blog.id):
+        record_revision(blog, blog.author, snapshot_interval=snapshot_interval)
+    
+    was_published = blog.published
+    delta = facet_delta([(blog.category, blog.author, blog.created_at)] if was_published else [], sign=-1)
+    blog.title = title
+    if content_changed:
+        blog.content = content
+        for field, value in content_metadata(content).items():
+            setattr(blog, field, value)
+    blog.excerpt = excerpt
+    blog.published = published
+    blog.publish_at = publish_at
+    blog.category = category
+    blog.updated_at = datetime.utcnow()
+    if blog.published:
+        facet_delta([(blog.category, blog.author, blog.created_at)], delta=delta)
+    apply_facet_delta(delta)
+    record_changes([blog.id], UPSERT)
+    record_revision(blog, current_admin()['name'], previous_content, snapshot_interval)
+    
+    db.session.commit()
+    invalidate_blog_cache(blog.id, blog.created_at, blog.published or was_published)
+    after_blog_write(blog.id)
+    if not blog.published:
+        publish_scheduler.schedule(blog.publish_at)
+    return True
+
+# Update blog. Without a publish_at key the post keeps its schedule; send
+# publish_at: null to drop it.
 @admin_bp.route('/admin/blogs/<int:blog_id>', methods=['PUT'])
 @login_required
 def update_blog(blog_id):
@@ -725,16 +278,41 @@ def update_blog(blog_id):
     
     if not data.get('title') or not data.get('content'):
         return jsonify({'error': 'Title and content are required'}), 400
+    try:
+        publish_at = parse_publish_at(data['publish_at']) if 'publish_at' in data else blog.publish_at
+    except ValueError:
+        return jsonify({'error': 'publish_at must be an ISO 8601 timestamp'}), 400
     
-    blog.title = data['title']
-    blog.content = data['content']
-    blog.excerpt = data.get('excerpt', '')
-    blog.published = data.get('published', True)
-    blog.category = data.get('category', '')
-    blog.updated_at = datetime.utcnow()
-    
-    db.session.commit()
-    
+    apply_blog_update(blog, data['title'], data['content'], data.get('excerpt'), data.get('published', True),
+                      data.get('category', ''), publish_at)
+    return jsonify(blog.to_dict()), 200
+
+# Revision history of a blog, newest first (admin)
+@admin_bp.route('/admin/blogs/<int:blog_id>/revisions', methods=['GET'])
+@login_required
+def get_blog_revisions(blog_id):
+    Blog.query.get_or_404(blog_id)
+    return jsonify({'revisions': [revision.to_dict() for revision in list_revisions(blog_id)]}), 200
+
+# One past version of a blog (admin)
+@admin_bp.route('/admin/blogs/<int:blog_id>/revisions/<int:number>', methods=['GET'])
+@login_required
+def get_blog_revision(blog_id, number):
+    revision, content = load_revision(blog_id, number)
+    if revision is None:
+        abort(404)
+    return jsonify(revision.to_dict(content)), 200
+
+# Make a past version the current one; saved as a new revision (admin)
+@admin_bp.route('/admin/blogs/<int:blog_id>/revisions/<int:number>/restore', methods=['POST'])
+@login_required
+def restore_blog_revision(blog_id, number):
+    blog = Blog.query.get_or_404(blog_id)
+    revision, content = load_revision(blog_id, number)
+    if revision is None:
+        abort(404)
+    apply_blog_update(blog, revision.title, content, revision.excerpt, revision.published, revision.category,
+                      blog.publish_at)
     return jsonify(blog.to_dict()), 200
 
 # Delete blog
@@ -742,20 +320,233 @@ def update_blog(blog_id):
 @login_required
 def delete_blog(blog_id):
     blog = Blog.query.get_or_404(blog_id)
+    created_at, was_published = blog.created_at, blog.published
+    if was_published:
+        apply_facet_delta(facet_delta([(blog.category, blog.author, created_at)], sign=-1))
+    record_changes([blog_id], DELETE)
+    delete_revisions([blog_id])
     db.session.delete(blog)
     db.session.commit()
+    invalidate_blog_cache(blog_id, created_at, was_published)
+    after_blog_write(blog_id)
     
     return jsonify({'message': 'Blog deleted successfully'}), 200
 
+# Bulk import blogs from a JSON array or an NDJSON stream
+@admin_bp.route('/admin/blogs/bulk', methods=['POST'])
+@login_required
+def bulk_import_blogs():
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = iter_ndjson(iter_lines(request.stream))
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            return jsonify({'error': 'Expected a JSON array or an NDJSON body'}), 400
+    
+    result = import_blogs(items, current_admin()['name'], current_app.config['BULK_BATCH_SIZE'])
+    if result['inserted']:
+        blog_cache.clear()
+        after_blog_write()
+        publish_scheduler.refresh()
+    return jsonify(result), 200 if not result['errors'] else 207
+
+# Bulk publish/unpublish blogs
+@admin_bp.route('/admin/blogs/bulk', methods=['PATCH'])
+@login_required
+def bulk_publish_blogs():
+    data = request.get_json(silent=True)
+    try:
+        ids = parse_ids(data)
+    except BulkItemError as exc:
+        return jsonify({'error': str(exc)}), 400
+    if not isinstance(data.get('published'), bool):
+        return jsonify({'error': 'published must be a boolean'}), 400
+    
+    updated = set_published(ids, data['published'])
+    if updated:
+        blog_cache.clear()
+        after_blog_write()
+    return jsonify({'updated': updated}), 200
+
+# Bulk delete blogs
+@admin_bp.route('/admin/blogs/bulk', methods=['DELETE'])
+@login_required
+def bulk_delete_blogs():
+    try:
+        ids = parse_ids(request.get_json(silent=True))
+    except BulkItemError as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    deleted = delete_blogs(ids)
+    if deleted:
+        blog_cache.clear()
+        after_blog_write()
+    return jsonify({'deleted': deleted}), 200
+
+# Change feed for /blogs/changes and /admin/blogs/changes. Without since=
+# the response only carries the current position; clients take it before
+# loading a listing and pass it back to receive later changes. With
+# Accept: text/event-stream the admin feed is streamed as Server-Sent
+# Events. A stream holds a worker thread for CHANGES_STREAM_SECONDS, so the
+# anonymous public feed is poll-only.
+def changes_response(include_drafts):
+    if wants_event_stream() and not include_drafts:
+        return jsonify({'error': 'Event streams are only available on the admin feed; poll with since='}), 406
+    
+    raw = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        since = int(raw) if raw is not None else None
+        if since is not None and since < 0:
+            raise ValueError
+    except (InvalidPageRequest, ValueError):
+        return jsonify({'error': 'since must be a change position from this feed and limit a page size'}), 400
+    
+    head = head_seq()
+    if since is None:
+        since = head
+        if not wants_event_stream():
+            return jsonify({'changes': [], 'since': str(head), 'has_more': False}), 200
+    elif since > head:
+        return jsonify({'error': 'Unknown change position; reload the listing', 'since': str(head)}), 410
+    
+    if wants_event_stream():
+        return stream_events(lambda position: changes_since(position, limit, include_drafts), since)
+    changes, position, has_more = changes_since(since, limit, include_drafts)
+    return jsonify({'changes': changes, 'since': str(position), 'has_more': has_more}), 200
+
+# Blog changes including drafts (admin)
+@admin_bp.route('/admin/blogs/changes', methods=['GET'])
+@login_required
+def get_blog_changes():
+    return changes_response(include_drafts=True)
+
+# Background job status (admin)
+@admin_bp.route('/admin/jobs', methods=['GET'])
+@login_required
+def get_jobs():
+    status = request.args.get('status')
+    if status and status not in Job.STATUSES:
+        return jsonify({'error': f"status must be one of {', '.join(Job.STATUSES)}"}), 400
+    try:
+        limit = parse_limit(request.args.get('limit'))
+    except InvalidPageRequest as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    query = Job.query.order_by(Job.id.desc())
+    if status:
+        query = query.filter_by(status=status)
+    if request.args.get('kind'):
+        query = query.filter_by(kind=request.args['kind'])
+    return jsonify({'counts': job_queue.counts(), 'jobs': [job.to_dict() for job in query.limit(limit)]}), 200
+
+@admin_bp.route('/admin/jobs/<int:job_id>', methods=['GET'])
+@login_required
+def get_job(job_id):
+    job = Job.query.get_or_404(job_id)
+    return jsonify(job.to_dict()), 200
+
+# Public response cache statistics
+@admin_bp.route('/admin/cache', methods=['GET'])
+@login_required
+def get_cache_stats():
+    return jsonify({'blogs': blog_cache.stats(), 'admin_identities': admin_identity_cache.stats()}), 200
+
 # Public API to get published blogs
 @admin_bp.route('/blogs', methods=['GET'])
+@publish_due_first
+@replica_read
 def get_public_blogs():
-    blogs = Blog.query.filter_by(published=True).order_by(Blog.created_at.desc()).all()
-    return jsonify([blog.to_dict() for blog in blogs]), 200
+    try:
+        limit, cursor = page_args(request.args)
+        fields = parse_fields(request.args.get('fields'))
+        filters = parse_filters(request.args)
+    except InvalidPageRequest as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    key = ('blogs', cursor, limit, fields, filters.get('category'), filters.get('author'))
+    version = head_seq()
+    entry = blog_cache.get(key, version)
+    if entry is None:
+        etag, last_modified = listing_validators(key, filters)
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        try:
+            columns = blog_columns(fields)
+            rows, next_cursor = paginate_blogs(db.select(*columns).filter_by(published=True, **filters),
+                                               limit, cursor)
+        except InvalidPageRequest as exc:
+            return jsonify({'error': str(exc)}), 400
+        body = json_bytes({'blogs': RowSerializer(columns, fields)(rows), 'next_cursor': next_cursor})
+        entry = blog_cache.set(key, body, span=page_span(cursor, rows, next_cursor),
+                               etag=etag, last_modified=last_modified, version=version)
+    return cached_json_response(entry)
+
+# Public changes to published blogs since a feed position
+@admin_bp.route('/blogs/changes', methods=['GET'])
+@publish_due_first
+@replica_read
+def get_public_blog_changes():
+    return changes_response(include_drafts=False)
+
+# Public per-category, per-author and per-month published post counts
+@admin_bp.route('/blogs/facets', methods=['GET'])
+@publish_due_first
+@replica_read
+def get_public_blog_facets():
+    key = ('facets',)
+    version = head_seq()
+    entry = blog_cache.get(key, version)
+    if entry is None:
+        body = json_bytes(blog_facets())
+        entry = blog_cache.set(key, body, etag=hashlib.sha256(body).hexdigest()[:32], version=version)
+    return cached_json_response(entry)
+
+# Public full-text search over published blogs
+@admin_bp.route('/blogs/search', methods=['GET'])
+@publish_due_first
+@replica_read
+def search_public_blogs():
+    query = build_match_query(request.args.get('q'))
+    if not query:
+        return jsonify({'error': 'Search query required'}), 400
+    if not search_available(db.engine):
+        return jsonify({'error': 'Search is not available on this database'}), 501
+    try:
+        limit = parse_limit(request.args.get('limit'))
+        offset = parse_offset(request.args.get('offset'))
+    except InvalidPageRequest as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    rows = search_blogs(query, limit + 1, offset)
+    results = [{
+        'id': row['id'],
+        'title': row['title'],
+        'excerpt': row['excerpt'],
+        'author': row['author'],
+        'created_at': row['created_at'].isoformat(),
+        'category': row['category'],
+        'snippet': row['snippet'],
+        'rank': row['rank']
+    } for row in rows[:limit]]
+    next_offset = offset + limit if len(rows) > limit else None
+    return jsonify({'results': results, 'next_offset': next_offset}), 200
 
 # Public API to get single published blog
 @admin_bp.route('/blogs/<int:blog_id>', methods=['GET'])
+@publish_due_first
+@replica_read
 def get_public_blog(blog_id):
-    blog = Blog.query.filter_by(id=blog_id, published=True).first_or_404()
-    return jsonify(blog.to_dict()), 200
-
+    key = ('blog', blog_id)
+    version = db.session.execute(blog_seq_query(blog_id)).scalar()
+    entry = blog_cache.get(key, version)
+    if entry is None:
+        etag, last_modified = blog_validators(blog_id)
+        if etag is None:
+            abort(404)
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        blog = Blog.query.filter_by(id=blog_id, published=True).first_or_404()
+        entry = blog_cache.set(key, json_bytes(blog.to_dict()), etag=make_etag('blog', blog.id, blog.updated_at),
+                               last_modified=blog.updated_at, version=version)
+    return cached_json_response(entry)
@@ -0,0 +1,85 @@
+from flask import abort, jsonify, request
+from src.models.async_db import async_reader
+from src.models.blog import Blog
+from src.models.changes import blog_seq_query, head_seq_query
+from src.models.user import User, db
+from src.routes.admin import blog_validator_query, cached_json_response, listing_etag, listing_validator_query
+from src.utils.cache import blog_cache
+from src.utils.conditional import is_not_modified, make_etag, not_modified_response
+from src.utils.pagination import (InvalidPageRequest, blog_columns, keyset_page, page_args, page_span, parse_fields,
+                                  parse_filters, split_page)
+from src.utils.scheduler import publish_due_first_async
+from src.utils.serialization import RowSerializer, json_bytes
+
+# Coroutine versions of the public read views, used by the ASGI entry point
+# (src/asgi.py) instead of the sync views registered under the same
+# endpoint names. They share the response cache, validators and
+# serialization with the sync views, so responses are byte-for-byte the same.
+
+async def get_public_blogs():
+    await publish_due_first_async()
+    try:
+        limit, cursor = page_args(request.args)
+        fields = parse_fields(request.args.get('fields'))
+        filters = parse_filters(request.args)
+    except InvalidPageRequest as exc:
+        return jsonify({'error': str(exc)}), 400
+    
+    key = ('blogs', cursor, limit, fields, filters.get('category'), filters.get('author'))
+    version = (await async_reader.fetch_one(head_seq_query()))[0] or 0
+    entry = blog_cache.get(key, version)
+    if entry is None:
+        etag, last_modified = listing_etag(key, await async_reader.fetch_one(listing_validator_query(filters)))
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        try:
+            columns = blog_columns(fields)
+            statement = keyset_page(db.select(*columns).filter_by(published=True, **filters), limit, cursor)
+            rows, next_cursor = split_page(await async_reader.fetch(statement), limit)
+        except InvalidPageRequest as exc:
+            return jsonify({'error': str(exc)}), 400
+        body = json_bytes({'blogs': RowSerializer(columns, fields)(rows), 'next_cursor': next_cursor})
+        entry = blog_cache.set(key, body, span=page_span(cursor, rows, next_cursor),
+                               etag=etag, last_modified=last_modified, version=version)
+    return cached_json_response(entry)
+
+async def get_public_blog(blog_id):
+    await publish_due_first_async()
+    key = ('blog', blog_id)
+    version = await async_reader.fetch_one(blog_seq_query(blog_id))
+    version = version[0] if version is not None else None
+    entry = blog_cache.get(key, version)
+    if entry is None:
+        row = await async_reader.fetch_one(blog_validator_query(blog_id))
+        if row is None:
+            abort(404)
+        etag, last_modified = make_etag('blog', blog_id, row.updated_at), row.updated_at
+        if is_not_modified(etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        columns = blog_columns(Blog.FIELDS)
+        row = await async_reader.fetch_one(db.select(*columns).filter_by(id=blog_id, published=True))
+        if row is None:
+            abort(404)
+        blog = RowSerializer(columns, Blog.FIELDS)([row])[0]
+        entry = blog_cache.set(key, json_bytes(blog), etag=make_etag('blog', blog_id, row.updated_at),
+                               last_modified=row.updated_at, version=version)
+    return cached_json_response(entry)
+
+async def get_users():
+    columns = [getattr(User, field) for field in User.FIELDS]
+    rows = await async_reader.fetch(db.select(*columns))
+    return jsonify(RowSerializer(columns, User.FIELDS)(rows))
+
+async def get_user(user_id):
+    columns = [getattr(User, field) for field in User.FIELDS]
+    row = await async_reader.fetch_one(db.select(*columns).filter_by(id=user_id))
+    if row is None:
+        abort(404)
+    return jsonify(RowSerializer(columns, User.FIELDS)([row])[0])
+
+ASYNC_VIEWS = {
+    'admin.get_public_blogs': get_public_blogs,
+    'admin.get_public_blog': get_public_blog,
+    'user.get_users': get_users,
+    'user.get_user': get_user,
+}
@@ -1,12 +1,20 @@
 from flask import Blueprint, jsonify, request
+from src.models.routing import replica_read
 from src.models.user import User, db
+from src.utils.serialization import RowSerializer
+from src.utils.streaming import stream_json_array, wants_stream
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/users', methods=['GET'])
+@replica_read
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    columns = [getattr(User, field) for field in User.FIELDS]
+    serializer = RowSerializer(columns, User.FIELDS)
+    if wants_stream(request.args):
+        return stream_json_array(db.select(*columns).order_by(User.id), serializer)
+    rows = db.session.execute(db.select(*columns)).all()
+    return jsonify(serializer(rows))
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
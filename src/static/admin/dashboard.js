@@ -0,0 +1,278 @@
+const PAGE_SIZE = 20;
+let editingBlogId = null;
+let nextCursor = null;
+let changeStream = null;
+
+// Load blogs on page load, then follow changes instead of reloading
+document.addEventListener('DOMContentLoaded', async function() {
+    const since = await changePosition();
+    await loadBlogs();
+    followChanges(since);
+    loadCategories();
+});
+
+async function changePosition() {
+    try {
+        const response = await fetch('/api/admin/blogs/changes');
+        return response.ok ? (await response.json()).since : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+// Apply created, edited and deleted posts to the list as they happen
+function followChanges(since) {
+    if (since === null || !window.EventSource) {
+        return;
+    }
+    changeStream = new EventSource(`/api/admin/blogs/changes?since=${encodeURIComponent(since)}`);
+    changeStream.addEventListener('change', (event) => {
+        const change = JSON.parse(event.data);
+        const existing = document.querySelector(`.blog-item[data-id="${change.id}"]`);
+        if (change.op === 'delete') {
+            if (existing) {
+                existing.remove();
+            }
+        } else if (existing) {
+            existing.replaceWith(renderBlogItem(change.blog));
+        } else {
+            insertBlogItem(change.blog);
+        }
+    });
+    changeStream.addEventListener('error', () => {
+        // The stream is gone for good (e.g. logged out); fall back to reloading
+        if (changeStream.readyState === EventSource.CLOSED) {
+            changeStream = null;
+        }
+    });
+}
+
+// Newest first by (created_at, id), the listing's order. ISO timestamps from
+// the API compare correctly as strings.
+function isNewer(blog, item) {
+    const createdAt = item.dataset.createdAt;
+    return blog.created_at > createdAt || (blog.created_at === createdAt && blog.id > Number(item.dataset.id));
+}
+
+// Put a post that is not shown yet in its place in the list. Posts older
+// than the last loaded one are left for "Load More" to fetch in order.
+function insertBlogItem(blog) {
+    const blogList = document.getElementById('blogList');
+    const next = Array.from(blogList.querySelectorAll('.blog-item')).find(item => isNewer(blog, item));
+    if (next) {
+        blogList.insertBefore(renderBlogItem(blog), next);
+    } else if (!nextCursor) {
+        blogList.appendChild(renderBlogItem(blog));
+    }
+}
+
+// Reload the list after a write unless the change stream will deliver it
+function refreshBlogs() {
+    if (!changeStream) {
+        loadBlogs();
+    }
+}
+
+// Add categories in use to the fixed choices in the form
+async function loadCategories() {
+    try {
+        const response = await fetch('/api/blogs/facets');
+        if (!response.ok) {
+            return;
+        }
+        const facets = await response.json();
+        const select = document.getElementById('category');
+        const known = new Set(Array.from(select.options, option => option.value));
+        facets.category.forEach(facet => {
+            if (!known.has(facet.value)) {
+                select.add(new Option(facet.value, facet.value));
+            }
+        });
+    } catch (error) {
+        // Keep the built-in choices
+    }
+}
+
+// Blog form submission
+document.getElementById('blogForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const formData = new FormData(e.target);
+    const blogData = {
+        title: formData.get('title'),
+        excerpt: formData.get('excerpt'),
+        category: formData.get('category'),
+        content: formData.get('content'),
+        published: formData.get('published') === 'on',
+        // datetime-local values are local time; the API takes UTC
+        publish_at: formData.get('publish_at') ? new Date(formData.get('publish_at')).toISOString() : null
+    };
+
+    try {
+        let response;
+        if (editingBlogId) {
+            response = await fetch(`/api/admin/blogs/${editingBlogId}`, {
+                method: 'PUT',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(blogData)
+            });
+        } else {
+            response = await fetch('/api/admin/blogs', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(blogData)
+            });
+        }
+
+        const result = await response.json();
+
+        if (response.ok) {
+            showMessage(editingBlogId ? 'Blog updated successfully!' : 'Blog created successfully!', 'success');
+            resetForm();
+            refreshBlogs();
+        } else {
+            showMessage(result.error || 'Operation failed', 'error');
+        }
+    } catch (error) {
+        showMessage('Network error. Please try again.', 'error');
+    }
+});
+
+async function loadBlogs(append = false) {
+    if (!append) {
+        nextCursor = null;
+    }
+
+    try {
+        const params = new URLSearchParams({ limit: PAGE_SIZE });
+        if (append && nextCursor) {
+            params.set('cursor', nextCursor);
+        }
+
+        const response = await fetch(`/api/admin/blogs?${params}`);
+        const page = await response.json();
+
+        const blogList = document.getElementById('blogList');
+        if (!append) {
+            blogList.innerHTML = '';
+        }
+
+        page.blogs.forEach(blog => {
+            blogList.appendChild(renderBlogItem(blog));
+        });
+
+        nextCursor = page.next_cursor;
+        document.getElementById('loadMoreBtn').style.display = nextCursor ? 'inline-block' : 'none';
+    } catch (error) {
+        showMessage('Failed to load blogs', 'error');
+    }
+}
+
+// publish_at comes back as naive UTC
+function publishTime(blog) {
+    return blog.publish_at ? new Date(`${blog.publish_at}Z`) : null;
+}
+
+function publishStatus(blog) {
+    if (blog.published) {
+        return '<span style="color: #44ff44;">Published</span>';
+    }
+    const publishAt = publishTime(blog);
+    if (publishAt) {
+        return `<span style="color: #ffaa44;">Scheduled for ${publishAt.toLocaleString()}</span>`;
+    }
+    return '<span style="color: #ff4444;">Draft</span>';
+}
+
+function renderBlogItem(blog) {
+    const blogItem = document.createElement('div');
+    blogItem.className = 'blog-item';
+    blogItem.dataset.id = blog.id;
+    blogItem.dataset.createdAt = blog.created_at;
+    blogItem.innerHTML = `
+        <div class="blog-title">${blog.title}</div>
+        <div class="blog-meta">
+            By ${blog.author} | ${new Date(blog.created_at).toLocaleDateString()} | ${blog.category || 'Uncategorized'}${blog.reading_time ? ` | ${blog.reading_time} min read` : ''}
+            ${publishStatus(blog)}
+        </div>
+        <div class="blog-excerpt">${blog.excerpt || 'No excerpt'}</div>
+        <div class="blog-actions">
+            <button class="btn btn-small" onclick="editBlog(${blog.id})">Edit</button>
+            <button class="btn btn-danger btn-small" onclick="deleteBlog(${blog.id})">Delete</button>
+        </div>
+    `;
+    return blogItem;
+}
+
+async function editBlog(id) {
+    try {
+        const response = await fetch(`/api/admin/blogs/${id}`);
+        const blog = await response.json();
+
+        document.getElementById('blogId').value = blog.id;
+        document.getElementById('title').value = blog.title;
+        document.getElementById('excerpt').value = blog.excerpt || '';
+        document.getElementById('category').value = blog.category || '';
+        document.getElementById('content').value = blog.content;
+        document.getElementById('published').checked = blog.published || Boolean(blog.publish_at);
+        const publishAt = publishTime(blog);
+        document.getElementById('publishAt').value = publishAt && !blog.published
+            ? new Date(publishAt.getTime() - publishAt.getTimezoneOffset() * 60000).toISOString().slice(0, 16)
+            : '';
+
+        document.getElementById('submitBtn').textContent = 'Update Post';
+        document.getElementById('cancelBtn').style.display = 'inline-block';
+
+        editingBlogId = id;
+    } catch (error) {
+        showMessage('Failed to load blog for editing', 'error');
+    }
+}
+
+async function deleteBlog(id) {
+    if (confirm('Are you sure you want to delete this blog post?')) {
+        try {
+            const response = await fetch(`/api/admin/blogs/${id}`, {
+                method: 'DELETE'
+            });
+
+            if (response.ok) {
+                showMessage('Blog deleted successfully!', 'success');
+                refreshBlogs();
+            } else {
+                const result = await response.json();
+                showMessage(result.error || 'Delete failed', 'error');
+            }
+        } catch (error) {
+            showMessage('Network error. Please try again.', 'error');
+        }
+    }
+}
+
+function resetForm() {
+    document.getElementById('blogForm').reset();
+    document.getElementById('blogId').value = '';
+    document.getElementById('submitBtn').textContent = 'Create Post';
+    document.getElementById('cancelBtn').style.display = 'none';
+    editingBlogId = null;
+}
+
+function showMessage(text, type) {
+    const message = document.getElementById('message');
+    message.textContent = text;
+    message.className = `message ${type}`;
+    message.style.display = 'block';
+
+    setTimeout(() => {
+        message.style.display = 'none';
+    }, 5000);
+}
+
+async function logout() {
+    try {
+        await fetch('/api/admin/logout', { method: 'POST' });
+        window.location.href = '/api/admin';
+    } catch (error) {
+        console.error('Logout failed:', error);
+    }
+}
@@ -0,0 +1,223 @@
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import parse_qsl
+
+from werkzeug.exceptions import ClientDisconnected, HTTPException
+
+from src.utils.streaming import wants_stream
+
+
+def _header_environ(scope, body_length):
+    environ = {}
+    for raw_name, raw_value in scope['headers']:
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            key = 'CONTENT_TYPE'
+        elif name == 'CONTENT_LENGTH':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = f'HTTP_{name}'
+        if key in environ:
+            value = environ[key] + ('; ' if key == 'HTTP_COOKIE' else ',') + value
+        environ[key] = value
+    if body_length is not None:
+        environ.setdefault('CONTENT_LENGTH', str(body_length))
+    return environ
+
+
+# wsgi.input for the WSGI thread. Request body messages are pulled from the
+# ASGI receive channel as the app reads them, so uploads such as NDJSON
+# imports are never held in memory whole.
+class RequestBody(io.RawIOBase):
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b''
+        self._done = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer and not self._done:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._done = True
+                raise ClientDisconnected()
+            self._buffer = message.get('body', b'')
+            self._done = not message.get('more_body')
+        count = min(len(target), len(self._buffer))
+        target[:count] = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        return count
+
+
+# PEP 3333 environ for an ASGI HTTP scope. body is either the whole body as
+# bytes or a binary stream read to EOF (wsgi.input_terminated).
+def build_environ(scope, body):
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body) if isinstance(body, bytes) else body,
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    environ.update(_header_environ(scope, len(body) if isinstance(body, bytes) else None))
+    return environ
+
+
+def _asgi_headers(headers):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+
+# ASGI application around the Flask app. Requests whose endpoint has a
+# coroutine in async_views run on the event loop; everything else (admin,
+# writes, streaming responses, static files) runs the WSGI app in a thread
+# pool, with response chunks forwarded as they are produced. At most
+# WSGI_QUEUE_CHUNKS chunks wait for a slow client before the WSGI thread
+# blocks, so streamed responses keep flat memory here too.
+class ASGIAdapter:
+    WSGI_QUEUE_CHUNKS = 8
+
+    def __init__(self, app, async_views, threads=16, on_startup=(), on_shutdown=()):
+        self.app = app
+        self.async_views = async_views
+        self.threads = threads
+        self.on_startup = list(on_startup)
+        self.on_shutdown = list(on_shutdown)
+        self._executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            environ = build_environ(scope, io.BufferedReader(RequestBody(receive, asyncio.get_running_loop()),
+                                                             64 * 1024))
+            view = self._async_view(environ)
+            if view is not None:
+                await self._call_async(environ, *view, send)
+            else:
+                await self._call_wsgi(environ, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                for hook in self.on_startup:
+                    await hook()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for hook in self.on_shutdown:
+                    await hook()
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _async_view(self, environ):
+        if environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return None
+        try:
+            endpoint, args = self.app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return None
+        view = self.async_views.get(endpoint)
+        # Streaming responses stay on the sync path
+        if view is None or wants_stream(dict(parse_qsl(environ['QUERY_STRING']))):
+            return None
+        return view, args
+
+    # Same steps as Flask.full_dispatch_request(), with the view awaited.
+    async def _call_async(self, environ, view, args, send):
+        app = self.app
+        with app.request_context(environ):
+            try:
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        rv = await view(**args)
+                except HTTPException as exc:
+                    rv = app.handle_http_exception(exc)
+                response = app.process_response(app.make_response(rv))
+            except Exception as exc:
+                response = app.make_response(app.handle_exception(exc))
+            body = b'' if environ['REQUEST_METHOD'] == 'HEAD' else response.get_data()
+            headers = response.get_wsgi_headers(environ)
+        await send({'type': 'http.response.start', 'status': response.status_code,
+                    'headers': _asgi_headers(headers.to_wsgi_list())})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _call_wsgi(self, environ, send):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.WSGI_QUEUE_CHUNKS)
+        cancelled = threading.Event()
+
+        # Blocks while the queue is full; gives up once the response is
+        # abandoned (client gone or send failed).
+        def put(item):
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while not cancelled.is_set():
+                try:
+                    return future.result(timeout=1)
+                except FutureTimeoutError:
+                    pass
+            future.cancel()
+
+        def start_response(status, headers, exc_info=None):
+            put(('start', int(status.split(' ', 1)[0]), headers))
+            return lambda data: put(('body', data))
+
+        def run():
+            try:
+                iterable = self.app(environ, start_response)
+                try:
+                    for chunk in iterable:
+                        if cancelled.is_set():
+                            break
+                        if chunk:
+                            put(('body', chunk))
+                finally:
+                    if hasattr(iterable, 'close'):
+                        iterable.close()
+            except BaseException as exc:
+                put(('error', exc))
+            else:
+                put(('end', None))
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix='asgi-wsgi')
+        loop.run_in_executor(self._executor, run)
+        try:
+            while True:
+                kind, *item = await queue.get()
+                if kind == 'start':
+                    status, headers = item
+                    await send({'type': 'http.response.start', 'status': status,
+                                'headers': _asgi_headers(headers)})
+                elif kind == 'body':
+                    await send({'type': 'http.response.body', 'body': item[0], 'more_body': True})
+                elif kind == 'error':
+                    raise item[0]
+                else:
+                    await send({'type': 'http.response.body', 'body': b''})
+                    return
+        finally:
+            cancelled.set()
@@ -0,0 +1,165 @@
+import functools
+import math
+import secrets
+import threading
+import time
+
+from flask import g, jsonify, request, session
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from src.models.blog import Admin
+from src.models.user import db
+from src.utils.cache import ResponseCache
+
+# Authenticated admin identities keyed by the session id issued at login,
+# so requests don't re-query the admin row.
+admin_identity_cache = ResponseCache(max_entries=1024, ttl=60, config_prefix='ADMIN_IDENTITY_CACHE')
+
+
+# Token buckets kept in process memory. Any object with the same take()
+# signature (e.g. one backed by Redis) can be passed to LoginRateLimiter to
+# share limits between workers.
+class MemoryBucketStore:
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    # Take one token from key's bucket. Returns 0 on success or the number of
+    # seconds until a token is available.
+    def take(self, key, capacity, refill_per_second):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / refill_per_second
+            if key not in self._buckets and len(self._buckets) >= self.max_keys:
+                self._prune(now, capacity, refill_per_second)
+            self._buckets[key] = (tokens - 1, now)
+            return 0
+
+    # Full buckets carry no state; drop them (or the oldest half) when full.
+    def _prune(self, now, capacity, refill_per_second):
+        full = [key for key, (tokens, updated) in self._buckets.items()
+                if tokens + (now - updated) * refill_per_second >= capacity]
+        for key in full:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            oldest = sorted(self._buckets, key=lambda key: self._buckets[key][1])
+            for key in oldest[:len(oldest) // 2]:
+                del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Per-IP and per-account limits on login attempts, checked before the
+# deliberately slow password hash runs.
+class LoginRateLimiter:
+    def __init__(self, store=None):
+        self.store = store or MemoryBucketStore()
+        self.limits = {}
+
+    def init_app(self, app):
+        app.config.setdefault('LOGIN_RATE_LIMIT_STORE', None)
+        if app.config['LOGIN_RATE_LIMIT_STORE'] is not None:
+            self.store = app.config['LOGIN_RATE_LIMIT_STORE']
+        self.limits = {
+            'ip': (app.config['LOGIN_IP_BURST'], app.config['LOGIN_IP_PER_MINUTE'] / 60),
+            'account': (app.config['LOGIN_ACCOUNT_BURST'], app.config['LOGIN_ACCOUNT_PER_MINUTE'] / 60),
+        }
+
+    # Returns seconds to wait, or 0 if the attempt may proceed
+    def check(self, ip, email):
+        wait = 0
+        for scope, value in (('ip', ip), ('account', email.lower())):
+            capacity, rate = self.limits[scope]
+            wait = max(wait, self.store.take(f'login:{scope}:{value}', capacity, rate))
+        return wait
+
+
+login_limiter = LoginRateLimiter()
+
+
+@functools.lru_cache(maxsize=None)
+def hash_method_prefix(method):
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def needs_rehash(password_hash, method):
+    return password_hash.split('$', 1)[0] != hash_method_prefix(method)
+
+
+def too_many_attempts(wait):
+    response = jsonify({'error': 'Too many login attempts. Please try again later.'})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(math.ceil(wait))
+    return response
+
+
+# Verify credentials, upgrading the stored hash in place if it was made with
+# older parameters than ADMIN_PASSWORD_METHOD.
+def authenticate(email, password, method):
+    admin = Admin.query.filter_by(email=email).first()
+    if admin is None or not check_password_hash(admin.password, password):
+        return None
+    if needs_rehash(admin.password, method):
+        admin.password = generate_password_hash(password, method=method)
+        db.session.commit()
+    return admin
+
+
+def identity(admin):
+    return {'id': admin.id, 'name': admin.name, 'email': admin.email}
+
+
+def start_session(admin):
+    session.clear()
+    session['sid'] = secrets.token_urlsafe(16)
+    session['admin_id'] = admin.id
+    session['admin_name'] = admin.name
+    admin_identity_cache.set(session['sid'], identity(admin))
+
+
+def end_session():
+    if 'sid' in session:
+        admin_identity_cache.invalidate(session['sid'])
+    session.clear()
+
+
+# The signed-in admin as an identity dict, or None. Cached per session id.
+def current_admin():
+    if 'admin' in g:
+        return g.admin
+    admin_id, sid = session.get('admin_id'), session.get('sid')
+    if admin_id is None:
+        return None
+
+    entry = admin_identity_cache.get(sid) if sid else None
+    if entry is not None and entry.body['id'] == admin_id:
+        g.admin = entry.body
+        return g.admin
+
+    admin = db.session.get(Admin, admin_id)
+    g.admin = identity(admin) if admin else None
+    if g.admin and sid:
+        admin_identity_cache.set(sid, g.admin)
+    return g.admin
+
+
+# Admin login required decorator
+def login_required(f):
+    @functools.wraps(f)
+    def decorated_function(*args, **kwargs):
+        if current_admin() is None:
+            session.clear()
+            return jsonify({'error': 'Authentication required'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def client_ip():
+    return request.remote_addr or 'unknown'
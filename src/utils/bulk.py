@@ -0,0 +1,214 @@
+import json
+from datetime import datetime, timezone
+
+from src.models.blog import Blog
+from src.models.changes import DELETE, UPSERT, record_changes
+from src.models.facets import apply_facet_delta, facet_delta
+from src.models.revision import delete_revisions
+from src.models.user import db
+from src.utils.content import content_metadata, make_excerpt
+from src.utils.scheduler import parse_publish_at, publish_state
+
+
+class BulkItemError(ValueError):
+    pass
+
+
+def _text(item, field, max_length, required=False, default=None):
+    value = item.get(field, default)
+    if value is None or value == '':
+        if required:
+            raise BulkItemError(f'{field} is required')
+        return value
+    if not isinstance(value, str):
+        raise BulkItemError(f'{field} must be a string')
+    if max_length and len(value) > max_length:
+        raise BulkItemError(f'{field} is longer than {max_length} characters')
+    return value
+
+
+# Timestamps with an offset are converted to the naive UTC the table stores;
+# ones without are taken as UTC already.
+def _timestamp(item, field):
+    value = item.get(field)
+    if value is None:
+        return None
+    try:
+        value = datetime.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise BulkItemError(f'{field} must be an ISO 8601 timestamp') from exc
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Validate one imported post and turn it into a row for insert(Blog).
+# Imports keep their original author and timestamps when given.
+def blog_row(item, default_author):
+    if not isinstance(item, dict):
+        raise BulkItemError('item must be an object')
+    published = item.get('published', True)
+    if not isinstance(published, bool):
+        raise BulkItemError('published must be a boolean')
+
+    now = datetime.utcnow()
+    try:
+        published, publish_at = publish_state(published, parse_publish_at(item.get('publish_at')), now)
+    except ValueError as exc:
+        raise BulkItemError('publish_at must be an ISO 8601 timestamp') from exc
+    created_at = _timestamp(item, 'created_at') or now
+    content = _text(item, 'content', None, required=True)
+    return {
+        'title': _text(item, 'title', 200, required=True),
+        'content': content,
+        'excerpt': _text(item, 'excerpt', 500, default='') or make_excerpt(content),
+        'author': _text(item, 'author', 100, default=default_author) or default_author,
+        'category': _text(item, 'category', 100, default=''),
+        'published': published,
+        'publish_at': publish_at,
+        'created_at': created_at,
+        'updated_at': _timestamp(item, 'updated_at') or created_at,
+        **content_metadata(content),
+    }
+
+
+# Split a binary stream into lines reading large chunks; the WSGI input
+# stream's own readline() reads one byte at a time.
+def iter_lines(stream, chunk_size=64 * 1024):
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+# Parse NDJSON lazily; blank lines are skipped, bad lines become item errors.
+def iter_ndjson(lines):
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield BulkItemError('invalid JSON')
+
+
+def _flush(rows):
+    ids = db.session.execute(db.insert(Blog).returning(Blog.id), rows).scalars().all()
+    record_changes(ids, UPSERT)
+    apply_facet_delta(facet_delta((row['category'], row['author'], row['created_at'])
+                                  for row in rows if row['published']))
+    db.session.commit()
+
+
+# Insert posts in batches of batch_size, one transaction and one executemany
+# per batch. Invalid items are skipped and reported by position.
+def import_blogs(items, default_author, batch_size=500):
+    inserted, errors, batch = 0, [], []
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, BulkItemError):
+                raise item
+            batch.append(blog_row(item, default_author))
+        except BulkItemError as exc:
+            errors.append({'index': index, 'error': str(exc)})
+            continue
+        if len(batch) >= batch_size:
+            _flush(batch)
+            inserted += len(batch)
+            batch = []
+    if batch:
+        _flush(batch)
+        inserted += len(batch)
+    return {'inserted': inserted, 'errors': errors}
+
+
+def _chunks(ids, size=500):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def parse_ids(data):
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise BulkItemError('ids must be a non-empty list of integers')
+    return sorted(set(ids))
+
+
+def _facet_rows(chunk, *criteria):
+    return db.session.execute(db.select(Blog.id, Blog.published, Blog.category, Blog.author, Blog.created_at)
+                              .where(Blog.id.in_(chunk), *criteria)).all()
+
+
+def _facets(rows):
+    return [(row.category, row.author, row.created_at) for row in rows]
+
+
+def delete_blogs(ids):
+    deleted = 0
+    for chunk in _chunks(ids):
+        rows = _facet_rows(chunk)
+        apply_facet_delta(facet_delta(_facets(row for row in rows if row.published), sign=-1))
+        record_changes([row.id for row in rows], DELETE)
+        delete_revisions(chunk)
+        deleted += db.session.execute(db.delete(Blog).where(Blog.id.in_(chunk))).rowcount
+    db.session.commit()
+    return deleted
+
+
+# Publishing a scheduled post publishes it now; unpublishing cancels any
+# schedule, so scheduled drafts count as changed too.
+def set_published(ids, published):
+    updated = 0
+    now = datetime.utcnow()
+    if published:
+        changing_criteria = Blog.published.is_not(True)
+        statement = db.update(Blog).values(published=True, updated_at=now, publish_at=db.case(
+            (Blog.publish_at > now, now), else_=Blog.publish_at))
+    else:
+        changing_criteria = db.or_(Blog.published.is_not(False), Blog.publish_at.is_not(None))
+        statement = db.update(Blog).values(published=False, updated_at=now, publish_at=None)
+    for chunk in _chunks(ids):
+        changing = _facet_rows(chunk, changing_criteria)
+        apply_facet_delta(facet_delta(_facets(row for row in changing if row.published != published),
+                                      sign=1 if published else -1))
+        record_changes([row.id for row in changing], UPSERT)
+        result = db.session.execute(statement.where(Blog.id.in_(chunk), changing_criteria),
+                                    execution_options={'synchronize_session': False})
+        updated += result.rowcount
+    db.session.commit()
+    return updated
+
+
+# Fill in the derived columns (and empty excerpts) for posts written before
+# they existed, batch_size rows per transaction. Every post goes to the
+# change log, since its word count and reading time are part of the public
+# responses; only posts that get a generated excerpt get a new updated_at,
+# and the others keep their search index entries.
+def backfill_metadata(batch_size=500, everything=False):
+    updated, last_id = 0, 0
+    while True:
+        statement = db.select(Blog.id, Blog.content, Blog.excerpt).where(Blog.id > last_id)
+        if not everything:
+            statement = statement.where(Blog.content_hash.is_(None))
+        rows = db.session.execute(statement.order_by(Blog.id).limit(batch_size)).all()
+        if not rows:
+            return updated
+
+        now = datetime.utcnow()
+        plain = [{'id': row.id, **content_metadata(row.content)} for row in rows if row.excerpt]
+        excerpted = [{'id': row.id, 'excerpt': make_excerpt(row.content), 'updated_at': now,
+                      **content_metadata(row.content)} for row in rows if not row.excerpt]
+        for params in (plain, excerpted):
+            if params:
+                db.session.execute(db.update(Blog), params)
+        record_changes([row.id for row in rows], UPSERT)
+        db.session.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
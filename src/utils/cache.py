@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry:
+    __slots__ = ('body', 'expires_at', 'span', 'etag', 'last_modified', 'version')
+
+    def __init__(self, body, expires_at, span=None, etag=None, last_modified=None, version=None):
+        self.body = body
+        self.expires_at = expires_at
+        self.span = span
+        self.etag = etag
+        self.last_modified = last_modified
+        self.version = version
+
+    # A listing page's span is (upper, lower) in (created_at, id) sort order:
+    # upper is the cursor it was requested with and lower the key of its last
+    # row (None on the first/last page). A post whose sort key falls inside
+    # the span changes the page's contents when it is written.
+    def covers(self, sort_key):
+        upper, lower = self.span
+        return (upper is None or sort_key < upper) and (lower is None or sort_key >= lower)
+
+
+# Bounded LRU + TTL cache. Values are serialized response bodies or other
+# small immutable records; settings come from <config_prefix>_MAX_ENTRIES and
+# <config_prefix>_TTL.
+#
+# The cache is per process, so invalidate() only reaches the process that
+# made a write. Entries can also carry a version read from the database
+# before they were built (e.g. a change log position); get() only returns
+# an entry whose version matches the one the caller reads now, which keeps
+# every process in step with writes made by the others.
+class ResponseCache:
+    def __init__(self, max_entries=1024, ttl=300, config_prefix='BLOG_CACHE'):
+        self.config_prefix = config_prefix
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        app.config.setdefault(f'{self.config_prefix}_MAX_ENTRIES', self.max_entries)
+        app.config.setdefault(f'{self.config_prefix}_TTL', self.ttl)
+        self.max_entries = app.config[f'{self.config_prefix}_MAX_ENTRIES']
+        self.ttl = app.config[f'{self.config_prefix}_TTL']
+        self.clear()
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            elif entry is not None and entry.version != version:
+                del self._entries[key]
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, body, span=None, etag=None, last_modified=None, version=None):
+        entry = CacheEntry(body, time.monotonic() + self.ttl, span, etag, last_modified, version)
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    # Drop every cached listing page whose span includes sort_key.
+    def invalidate_listings(self, sort_key):
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if entry.span is not None and entry.covers(sort_key)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+# Public blog responses (/api/blogs and /api/blogs/<id>)
+blog_cache = ResponseCache()
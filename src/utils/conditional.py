@@ -0,0 +1,40 @@
+import hashlib
+from datetime import timezone
+
+from flask import Response, request
+
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+# HTTP dates have second precision and are always UTC; our timestamps are
+# naive UTC datetimes.
+def http_datetime(value):
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+
+# If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+def is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return http_datetime(last_modified) <= request.if_modified_since
+    return False
+
+
+def conditional_response(body, etag, last_modified, status=200):
+    response = Response(body, status=status, mimetype='application/json')
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = http_datetime(last_modified)
+    # Let browsers and the CDN keep a copy but revalidate it on every use.
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def not_modified_response(etag, last_modified):
+    response = conditional_response(None, etag, last_modified, status=304)
+    del response.headers['Content-Type']
+    return response
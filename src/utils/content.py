@@ -0,0 +1,41 @@
+import hashlib
+import html
+import math
+import re
+
+EXCERPT_LENGTH = 200
+WORDS_PER_MINUTE = 200
+
+_TAG = re.compile(r'<[^>]+>')
+_SPACE = re.compile(r'\s+')
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def plain_text(content):
+    return _SPACE.sub(' ', html.unescape(_TAG.sub(' ', content))).strip()
+
+
+# First EXCERPT_LENGTH characters of the post's plain text, cut at a word
+# boundary.
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    text = plain_text(content)
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    if ' ' in cut:
+        cut = cut.rsplit(' ', 1)[0]
+    return cut.rstrip(' .,;:') + '…'
+
+
+# Columns derived from a post's body, stored at write time so listings never
+# need to read content.
+def content_metadata(content):
+    words = len(plain_text(content).split())
+    return {
+        'word_count': words,
+        'reading_time': math.ceil(words / WORDS_PER_MINUTE) if words else 0,
+        'content_hash': content_hash(content),
+    }
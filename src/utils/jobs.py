@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from src.models.job import Job
+from src.models.user import db
+
+logger = logging.getLogger(__name__)
+
+
+# In-process worker pool over the persistent job table. Jobs are claimed
+# with a conditional UPDATE, so several processes can share one database;
+# a process only wakes immediately for jobs it enqueued itself and polls
+# for the rest. Workers are threads and must be started after forking.
+class JobQueue:
+    def __init__(self):
+        self.handlers = {}
+        self.app = None
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._purged_at = 0.0
+
+    def init_app(self, app):
+        self.app = app
+
+    # Register fn(key, payload) as the handler for a job kind.
+    def handler(self, kind):
+        def decorator(fn):
+            self.handlers[kind] = fn
+            return fn
+        return decorator
+
+    # Queue a job and commit. key is usually a blog id: while a job of this
+    # kind and key is still pending, enqueue returns it instead of adding a
+    # duplicate (the newest payload wins).
+    def enqueue(self, kind, key=None, payload=None, delay=0, max_attempts=None):
+        if kind not in self.handlers:
+            raise ValueError(f'No handler registered for job kind {kind!r}')
+        key = None if key is None else str(key)
+        body = json.dumps(payload) if payload is not None else None
+        job = Job.query.filter_by(kind=kind, key=key, status=Job.PENDING).first() if key is not None else None
+        if job is not None:
+            job.payload = body
+        else:
+            job = Job(kind=kind, key=key, payload=body,
+                      run_at=datetime.utcnow() + timedelta(seconds=delay),
+                      max_attempts=max_attempts or self.app.config['JOB_MAX_ATTEMPTS'])
+            db.session.add(job)
+        db.session.commit()
+        self._wakeup.set()
+        return job
+
+    def _claim(self):
+        now = datetime.utcnow()
+        expired = now - timedelta(seconds=self.app.config['JOB_LEASE_SECONDS'])
+        candidates = db.session.execute(
+            db.select(Job.id).where(db.or_(
+                db.and_(Job.status == Job.PENDING, Job.run_at <= now),
+                db.and_(Job.status == Job.RUNNING, Job.locked_at < expired),
+            )).order_by(Job.run_at, Job.id).limit(5)).scalars().all()
+        for job_id in candidates:
+            claimed = db.session.execute(
+                db.update(Job).where(Job.id == job_id, db.or_(
+                    db.and_(Job.status == Job.PENDING, Job.run_at <= now),
+                    db.and_(Job.status == Job.RUNNING, Job.locked_at < expired),
+                )).values(status=Job.RUNNING, locked_at=now, attempts=Job.attempts + 1),
+                execution_options={'synchronize_session': False}).rowcount
+            db.session.commit()
+            if claimed:
+                return db.session.get(Job, job_id)
+        db.session.commit()
+        return None
+
+    def _run(self, job):
+        try:
+            self.handlers[job.kind](job.key, json.loads(job.payload) if job.payload else None)
+        except Exception as exc:
+            db.session.rollback()
+            job = db.session.get(Job, job.id)
+            job.last_error = ''.join(traceback.format_exception_only(type(exc), exc)).strip()
+            if job.attempts >= job.max_attempts:
+                job.status = Job.FAILED
+                job.finished_at = datetime.utcnow()
+                logger.exception('Job %s (%s) failed permanently', job.id, job.kind)
+            else:
+                job.status = Job.PENDING
+                job.run_at = datetime.utcnow() + timedelta(
+                    seconds=self.app.config['JOB_BACKOFF_SECONDS'] * 2 ** (job.attempts - 1))
+                logger.warning('Job %s (%s) failed, retrying at %s: %s', job.id, job.kind, job.run_at,
+                               job.last_error)
+        else:
+            job.status = Job.DONE
+            job.finished_at = datetime.utcnow()
+        job.locked_at = None
+        db.session.commit()
+
+    # Run due jobs in the calling thread until none are left; returns the
+    # number run. Used by the workers and by `flask blogs run-jobs`.
+    def run_pending(self):
+        count = 0
+        while not self._stopping.is_set():
+            job = self._claim()
+            if job is None:
+                return count
+            self._run(job)
+            count += 1
+        return count
+
+    # Delete finished jobs older than JOB_RETENTION_HOURS; failed jobs are
+    # kept for inspection.
+    def purge(self):
+        cutoff = datetime.utcnow() - timedelta(hours=self.app.config['JOB_RETENTION_HOURS'])
+        deleted = db.session.execute(db.delete(Job).where(Job.status == Job.DONE, Job.finished_at < cutoff)).rowcount
+        db.session.commit()
+        return deleted
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    self.run_pending()
+                    if time.monotonic() - self._purged_at > 3600:
+                        self._purged_at = time.monotonic()
+                        self.purge()
+            except Exception:
+                logger.exception('Job worker error')
+            self._wakeup.wait(self.app.config['JOB_POLL_SECONDS'])
+            self._wakeup.clear()
+
+    def start(self, app=None):
+        if app is not None:
+            self.app = app
+        if self._threads:
+            return
+        self._stopping.clear()
+        for index in range(self.app.config['JOB_WORKERS']):
+            thread = threading.Thread(target=self._worker, name=f'job-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def counts(self):
+        rows = db.session.execute(db.select(Job.status, db.func.count()).group_by(Job.status))
+        return {status: 0 for status in Job.STATUSES} | dict(rows.all())
+
+
+job_queue = JobQueue()
@@ -0,0 +1,227 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import abort, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from src.models.user import db
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+# Remove the counts every process wrote to a METRICS_DIR, when the server
+# starts.
+def clear_metrics_dir(directory):
+    for name in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(name)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+HISTOGRAMS = (
+    ('latency', 'http_request_duration_seconds', 'Request latency.', LATENCY_BUCKETS),
+    ('sizes', 'http_response_size_bytes', 'Response body size.', SIZE_BUCKETS),
+    ('query_counts', 'db_queries_per_request', 'SQL statements executed per request.', QUERY_COUNT_BUCKETS),
+)
+
+
+# Per-endpoint request latency, response size, status codes and SQL query
+# counts/time, rendered in the Prometheus text format. Instrumentation runs
+# when METRICS_ENABLED is set or in debug mode, checked per request because
+# debug is often switched on after create_app() (e.g. app.run(debug=True));
+# the /api/metrics route answers 404 unless METRICS_ENABLED is set.
+#
+# Counts are kept per process. With METRICS_DIR set, each process also
+# writes them to <pid>.json there (at most every METRICS_FLUSH_SECONDS,
+# after a request) and /api/metrics serves the sum over every file, so a
+# scrape that reaches any worker sees the whole server. Files of exited
+# workers stay, so totals never go down; the directory is emptied when
+# gunicorn starts.
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+        self.slow_query_seconds = 0.1
+        self.n_plus_one_threshold = 10
+        self.directory = None
+        self.flush_seconds = 1.0
+        self._flushed_at = 0.0
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter()
+            self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+            self.sizes = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+            self.query_counts = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+            self.query_seconds = Counter()
+
+    def init_app(self, app):
+        app.add_url_rule('/api/metrics', 'metrics', self.metrics_view)
+        self.slow_query_seconds = app.config['METRICS_SLOW_QUERY_MS'] / 1000
+        self.n_plus_one_threshold = app.config['METRICS_N_PLUS_ONE_THRESHOLD']
+        self.directory = app.config['METRICS_DIR']
+        self.flush_seconds = app.config['METRICS_FLUSH_SECONDS']
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_request(self):
+        if not (current_app.config['METRICS_ENABLED'] or current_app.debug):
+            return
+        g.metrics_start = time.perf_counter()
+        g.sql_count = 0
+        g.sql_seconds = 0.0
+        g.sql_statements = Counter()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.metrics_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, 'metrics_start', None)
+        if start is None or not has_request_context() or 'sql_statements' not in g:
+            return
+        elapsed = time.perf_counter() - start
+        g.sql_count += 1
+        g.sql_seconds += elapsed
+        g.sql_statements[statement] += 1
+        if elapsed >= self.slow_query_seconds:
+            logger.warning('Slow query (%.1f ms) in %s: %s', elapsed * 1000, request.endpoint, statement[:500])
+
+    def _after_request(self, response):
+        if 'metrics_start' not in g:
+            return response
+        elapsed = time.perf_counter() - g.metrics_start
+        endpoint = request.endpoint or 'unmatched'
+
+        statement, repeats = next(iter(g.sql_statements.most_common(1)), (None, 0))
+        if repeats >= self.n_plus_one_threshold:
+            logger.warning('Possible N+1 in %s: statement ran %d times: %s', endpoint, repeats, statement[:500])
+
+        size = response.calculate_content_length()
+        with self._lock:
+            self.requests[(endpoint, request.method, response.status_code)] += 1
+            self.latency[endpoint].observe(elapsed)
+            if size is not None:
+                self.sizes[endpoint].observe(size)
+            self.query_counts[endpoint].observe(g.sql_count)
+            self.query_seconds[endpoint] += g.sql_seconds
+        if self.directory and time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self.flush()
+
+        if current_app.debug:
+            response.headers['Server-Timing'] = (f'app;dur={elapsed * 1000:.1f}, '
+                                                 f'db;dur={g.sql_seconds * 1000:.1f};desc="{g.sql_count} queries"')
+        return response
+
+    # This process's counts as plain JSON-able data
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': [[*key, count] for key, count in self.requests.items()],
+                'histograms': {name: {endpoint: [hist.counts, hist.total, hist.count]
+                                      for endpoint, hist in getattr(self, name).items()}
+                               for name, *_ in HISTOGRAMS},
+                'query_seconds': dict(self.query_seconds),
+            }
+
+    # Write this process's counts to METRICS_DIR
+    def flush(self):
+        self._flushed_at = time.monotonic()
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(f'{path}.tmp', path)
+
+    def _snapshots(self):
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for name in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(name, encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (FileNotFoundError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        requests = Counter()
+        histograms = {name: defaultdict(lambda buckets=buckets: Histogram(buckets))
+                      for name, _, _, buckets in HISTOGRAMS}
+        query_seconds = Counter()
+        for snapshot in self._snapshots():
+            for endpoint, method, status, count in snapshot['requests']:
+                requests[(endpoint, method, status)] += count
+            for name, series in snapshot['histograms'].items():
+                for endpoint, (counts, total, count) in series.items():
+                    hist = histograms[name][endpoint]
+                    hist.counts = [a + b for a, b in zip(hist.counts, counts)]
+                    hist.total += total
+                    hist.count += count
+            query_seconds.update(snapshot['query_seconds'])
+
+        lines = []
+        lines.append('# HELP http_requests_total Requests by endpoint, method and status.')
+        lines.append('# TYPE http_requests_total counter')
+        for (endpoint, method, status), count in sorted(requests.items()):
+            lines.append(f'http_requests_total{{endpoint="{_label(endpoint)}",method="{method}",'
+                         f'status="{status}"}} {count}')
+        for name, metric, help_text, _ in HISTOGRAMS:
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for endpoint, hist in sorted(histograms[name].items()):
+                label = f'endpoint="{_label(endpoint)}"'
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {hist.count}')
+                lines.append(f'{metric}_sum{{{label}}} {hist.total}')
+                lines.append(f'{metric}_count{{{label}}} {hist.count}')
+        lines.append('# HELP db_query_duration_seconds_total Time spent executing SQL.')
+        lines.append('# TYPE db_query_duration_seconds_total counter')
+        for endpoint, seconds in sorted(query_seconds.items()):
+            lines.append(f'db_query_duration_seconds_total{{endpoint="{_label(endpoint)}"}} {seconds}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        if not current_app.config['METRICS_ENABLED']:
+            abort(404)
+        return self.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+metrics = Metrics()
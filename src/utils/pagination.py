@@ -0,0 +1,125 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from src.models.blog import Blog
+from src.models.user import db
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+# Cursors are opaque to clients: base64 of the (created_at, id) sort key of
+# the last row on the previous page.
+def encode_cursor(created_at, blog_id):
+    raw = json.dumps([created_at.isoformat(), blog_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, blog_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(blog_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidPageRequest('Invalid cursor') from exc
+
+
+def parse_limit(raw):
+    if raw is None or raw == '':
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError as exc:
+        raise InvalidPageRequest('Invalid limit') from exc
+    if limit < 1:
+        raise InvalidPageRequest('Invalid limit')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_offset(raw):
+    if raw is None or raw == '':
+        return 0
+    try:
+        offset = int(raw)
+    except ValueError as exc:
+        raise InvalidPageRequest('Invalid offset') from exc
+    if offset < 0:
+        raise InvalidPageRequest('Invalid offset')
+    return offset
+
+
+def page_args(args):
+    return parse_limit(args.get('limit')), args.get('cursor') or None
+
+
+# Listing filters: exact matches on category= and author=, as filter_by()
+# keyword arguments. Blank values are ignored.
+def parse_filters(args):
+    filters = {}
+    for name in ('category', 'author'):
+        value = (args.get(name) or '').strip()
+        if len(value) > 100:
+            raise InvalidPageRequest(f'{name} is too long')
+        if value:
+            filters[name] = value
+    return filters
+
+
+# fields= accepts 'summary' (the default for listings), 'full', or a comma
+# separated list of Blog.FIELDS.
+def parse_fields(raw):
+    if not raw or raw == 'summary':
+        return Blog.SUMMARY_FIELDS
+    if raw == 'full':
+        return Blog.FIELDS
+
+    requested = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in Blog.FIELDS]
+    if unknown or not requested:
+        raise InvalidPageRequest(f"Unknown fields: {', '.join(unknown) or raw}")
+    return tuple(field for field in Blog.FIELDS if field in requested)
+
+
+# The requested columns plus the keyset sort key, for select(*columns).
+def blog_columns(fields):
+    columns = set(fields) | {'id', 'created_at'}
+    return [getattr(Blog, field) for field in Blog.FIELDS if field in columns]
+
+
+# Keyset pagination over a select() of Blog columns ordered newest first.
+# Rows inserted while a client is paging sort before the cursor, so later
+# pages never shift.
+def paginate_blogs(statement, limit, cursor=None):
+    rows = db.session.execute(keyset_page(statement, limit, cursor)).all()
+    return split_page(rows, limit)
+
+
+# The query half of paginate_blogs(): one row more than the page size, so
+# split_page() can tell whether another page follows.
+def keyset_page(statement, limit, cursor=None):
+    if cursor:
+        created_at, blog_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(Blog.created_at, Blog.id) < (created_at, blog_id))
+    return statement.order_by(Blog.created_at.desc(), Blog.id.desc()).limit(limit + 1)
+
+
+def split_page(rows, limit):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+# The (upper, lower) sort-key range a page covers, see CacheEntry.covers().
+def page_span(cursor, rows, next_cursor):
+    upper = decode_cursor(cursor) if cursor else None
+    lower = (rows[-1].created_at, rows[-1].id) if next_cursor else None
+    return upper, lower
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from flask import current_app
+
+from src.models.blog import Blog
+from src.models.user import db
+from src.utils.jobs import job_queue
+from src.utils.pagination import blog_columns, encode_cursor
+from src.utils.serialization import RowSerializer, json_bytes
+
+MANIFEST = 'manifest.json'
+URL_PREFIX = 'prerendered'
+
+_build_lock = threading.Lock()
+
+
+# Static copies of the public read API, written under PRERENDER_DIR:
+#
+#   blogs/<id>.json        body of GET /api/blogs/<id>
+#   blogs/index.json       first page of GET /api/blogs
+#   blogs/page/<n>.json    later pages, newest first, PRERENDER_PAGE_SIZE each
+#   manifest.json          updated_at and created_at per post and a hash per
+#                          index page
+#
+# Index pages have the same body as the API's (blogs and next_cursor); page
+# n + 1 is the file after page n. Builds are incremental: a post is
+# rewritten only when its updated_at differs from the manifest. Index pages
+# newer than every added, changed or removed post cannot have changed, so
+# only the pages from the first affected one on are regenerated, and of
+# those only the ones whose bytes changed are written.
+# The directory can be served by a front proxy or, with PRERENDER_SERVE, by
+# the catch-all route under /prerendered/.
+class SiteBuilder:
+    def __init__(self, output_dir, page_size):
+        self.output_dir = output_dir
+        self.page_size = page_size
+
+    def _path(self, name):
+        return os.path.join(self.output_dir, *name.split('/'))
+
+    def _write(self, name, body):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+    def _remove(self, name):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def load_manifest(self):
+        try:
+            with open(self._path(MANIFEST), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {'posts': {}, 'sort': {}, 'pages': {}}
+
+    def build(self, full=False):
+        with _build_lock:
+            return self._build(full)
+
+    def _build(self, full):
+        manifest = {'posts': {}, 'sort': {}, 'pages': {}} if full else self.load_manifest()
+        stats = {'posts_written': 0, 'posts_removed': 0, 'pages_written': 0, 'pages_removed': 0}
+
+        versions, sort = {}, {}
+        for blog_id, updated_at, created_at in db.session.execute(
+                db.select(Blog.id, Blog.updated_at, Blog.created_at).where(Blog.published)):
+            versions[str(blog_id)] = updated_at.isoformat()
+            sort[str(blog_id)] = created_at.isoformat()
+        changed = [int(blog_id) for blog_id, version in versions.items()
+                   if manifest['posts'].get(blog_id) != version]
+        removed = set(manifest['posts']) - set(versions)
+        for blog_id in removed:
+            self._remove(f'blogs/{blog_id}.json')
+            stats['posts_removed'] += 1
+
+        columns = blog_columns(Blog.FIELDS)
+        serialize = RowSerializer(columns, Blog.FIELDS)
+        for start in range(0, len(changed), 500):
+            rows = db.session.execute(db.select(*columns).where(Blog.id.in_(changed[start:start + 500]))).all()
+            for item in serialize(rows):
+                self._write(f"blogs/{item['id']}.json", json_bytes(item))
+                stats['posts_written'] += 1
+
+        first = self._first_affected_page(manifest, sort, changed, removed)
+        pages = {name: digest for name, digest in manifest['pages'].items() if self._page_number(name) < first}
+        for number, body in enumerate(self._index_pages(first), start=first):
+            name = self._page_name(number)
+            digest = hashlib.sha256(body).hexdigest()[:32]
+            pages[name] = digest
+            if manifest['pages'].get(name) != digest:
+                self._write(name, body)
+                stats['pages_written'] += 1
+        for name in set(manifest['pages']) - set(pages):
+            self._remove(name)
+            stats['pages_removed'] += 1
+
+        self._write(MANIFEST, json.dumps({'posts': versions, 'sort': sort, 'pages': pages}, sort_keys=True).encode())
+        return stats
+
+    @staticmethod
+    def _page_name(number):
+        return 'blogs/index.json' if number == 1 else f'blogs/page/{number}.json'
+
+    @staticmethod
+    def _page_number(name):
+        return 1 if name == 'blogs/index.json' else int(name[len('blogs/page/'):-len('.json')])
+
+    # The first index page to regenerate: the one before the page holding
+    # the newest post that was added, changed or removed (at its old or new
+    # position). Posts newer than that keep their positions, so earlier pages
+    # are unchanged; the page before may only gain or lose its next_cursor.
+    def _first_affected_page(self, manifest, sort, changed, removed):
+        if 'sort' not in manifest:
+            return 1
+        if not changed and not removed:
+            return len(manifest['pages']) + 1
+        keys = [(datetime.fromisoformat(positions[blog_id]), int(blog_id))
+                for blog_id in [str(blog_id) for blog_id in changed] + list(removed)
+                for positions in (manifest['sort'], sort) if blog_id in positions]
+        created_at, blog_id = max(keys)
+        newer = db.session.execute(
+            db.select(db.func.count()).select_from(Blog).where(Blog.published).where(db.or_(
+                Blog.created_at > created_at, db.and_(Blog.created_at == created_at, Blog.id > blog_id)))).scalar()
+        return max(1, newer // self.page_size)
+
+    # Index pages from page number first on, streamed from the listing index
+    # a page at a time.
+    def _index_pages(self, first=1):
+        columns = blog_columns(Blog.SUMMARY_FIELDS)
+        serialize = RowSerializer(columns, Blog.SUMMARY_FIELDS)
+        statement = (db.select(*columns).where(Blog.published).order_by(Blog.created_at.desc(), Blog.id.desc())
+                     .offset((first - 1) * self.page_size))
+        result = db.session.execute(statement, execution_options={'yield_per': self.page_size})
+        page = result.fetchmany(self.page_size)
+        if not page and first == 1:
+            yield json_bytes({'blogs': [], 'next_cursor': None})
+        while page:
+            following = result.fetchmany(self.page_size)
+            yield json_bytes({
+                'blogs': serialize(page),
+                'next_cursor': encode_cursor(page[-1].created_at, page[-1].id) if following else None,
+            })
+            page = following
+
+
+def site_builder():
+    output_dir = current_app.config['PRERENDER_DIR']
+    if not output_dir:
+        return None
+    return SiteBuilder(output_dir, current_app.config['PRERENDER_PAGE_SIZE'])
+
+
+# Bring the pre-rendered site up to date; no-op unless PRERENDER_DIR is
+# configured.
+def rebuild_site():
+    builder = site_builder()
+    return builder.build() if builder is not None else None
+
+
+@job_queue.handler('prerender')
+def prerender_job(key, payload):
+    rebuild_site()
+
+
+# Queue a rebuild after a blog write. A build covers the whole site, so
+# there is one pending job for it: writes to any posts before it runs
+# collapse into a single build.
+def schedule_rebuild():
+    if current_app.config['PRERENDER_DIR']:
+        job_queue.enqueue('prerender', key='site')
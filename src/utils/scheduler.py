@@ -0,0 +1,207 @@
+import asyncio
+import functools
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app
+
+from src.models.async_db import async_reader
+from src.models.blog import Blog
+from src.models.changes import UPSERT, record_changes
+from src.models.facets import apply_facet_delta, facet_delta
+from src.models.user import db
+from src.utils.cache import blog_cache
+from src.utils.prerender import schedule_rebuild
+
+logger = logging.getLogger(__name__)
+
+
+# Parse an ISO 8601 publish_at into the naive UTC datetimes the blog table
+# stores. Raises ValueError.
+def parse_publish_at(value):
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise ValueError('publish_at must be an ISO 8601 timestamp')
+    publish_at = datetime.fromisoformat(value)
+    if publish_at.tzinfo is not None:
+        publish_at = publish_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return publish_at
+
+
+# The (published, publish_at) a write should store. A publish_at in the
+# future holds the post back as a draft until then. A draft never keeps a
+# past publish_at, because the scheduler would publish it.
+def publish_state(published, publish_at, now=None):
+    if publish_at is None:
+        return published, None
+    if publish_at > (now or datetime.utcnow()):
+        return False, publish_at
+    return published, publish_at if published else None
+
+
+# Publish every scheduled post that is due, in one UPDATE over the
+# (published, publish_at) index, with the same facet and change log
+# bookkeeping as a manual publish. Several processes may run this at once;
+# each post is flipped, and so counted, only once. Returns the published ids.
+def publish_due(now=None):
+    now = now or datetime.utcnow()
+    rows = db.session.execute(
+        db.update(Blog).filter_by(published=False).where(Blog.publish_at <= now)
+        .values(published=True, updated_at=now)
+        .returning(Blog.id, Blog.category, Blog.author, Blog.created_at),
+        execution_options={'synchronize_session': False}).all()
+    if not rows:
+        db.session.commit()
+        return []
+    apply_facet_delta(facet_delta((row.category, row.author, row.created_at) for row in rows))
+    record_changes([row.id for row in rows], UPSERT)
+    db.session.commit()
+
+    for row in rows:
+        blog_cache.invalidate(('blog', row.id))
+        blog_cache.invalidate_listings((row.created_at, row.id))
+    blog_cache.invalidate(('facets',))
+    schedule_rebuild()
+    logger.info('Published %d scheduled posts', len(rows))
+    return [row.id for row in rows]
+
+
+# One row of any scheduled post that is due, from the (published,
+# publish_at) index.
+def due_query(now):
+    return db.select(Blog.id).filter_by(published=False).where(Blog.publish_at <= now).limit(1)
+
+
+# Publish scheduled posts that are due before a public read is served, so a
+# post appears at its publish_at even in a process without a scheduler
+# thread (e.g. under flask run) or while the thread is behind. Costs one
+# index lookup; the UPDATE only runs when something is due. Put it above
+# @replica_read so the lookup sees the primary.
+def publish_due_first(f):
+    @functools.wraps(f)
+    def decorated_function(*args, **kwargs):
+        now = datetime.utcnow()
+        if db.session.execute(due_query(now)).first() is not None:
+            publish_due(now)
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _publish_due_in(app, now):
+    with app.app_context():
+        publish_due(now)
+
+
+# publish_due_first for the async views: the lookup goes through
+# async_reader and the UPDATE runs in a thread.
+async def publish_due_first_async():
+    now = datetime.utcnow()
+    if await async_reader.fetch_one(due_query(now)) is not None:
+        await asyncio.to_thread(_publish_due_in, current_app._get_current_object(), now)
+
+
+# Thread that runs publish_due() when scheduled posts come due. Due times
+# are kept in a min-heap and the thread sleeps until the earliest, instead
+# of polling the blog table. Writes in this process push their due time
+# with schedule(); posts scheduled by other processes are found by reading
+# the earliest publish_at of any draft (one index lookup) every
+# PUBLISH_SCHEDULER_REFRESH_SECONDS and at startup, which also catches up
+# on posts that came due while no process was running. Like the job
+# workers, start it after forking.
+class PublishScheduler:
+    def __init__(self):
+        self.app = None
+        self._heap = []
+        self._queued = set()
+        self._condition = threading.Condition()
+        self._refresh = True
+        self._stopping = False
+        self._thread = None
+
+    def init_app(self, app):
+        self.app = app
+
+    def _push(self, publish_at):
+        if publish_at is not None and publish_at not in self._queued:
+            self._queued.add(publish_at)
+            heapq.heappush(self._heap, publish_at)
+
+    # Wake for a post this process scheduled at publish_at.
+    def schedule(self, publish_at):
+        with self._condition:
+            self._push(publish_at)
+            self._condition.notify()
+
+    # Re-read the next due time from the database, e.g. after a bulk import.
+    def refresh(self):
+        with self._condition:
+            self._refresh = True
+            self._condition.notify()
+
+    def next_due(self):
+        with self._condition:
+            return self._heap[0] if self._heap else None
+
+    def _due(self, now):
+        with self._condition:
+            due = False
+            while self._heap and self._heap[0] <= now:
+                self._queued.discard(heapq.heappop(self._heap))
+                due = True
+            return due
+
+    def _run(self):
+        refresh_seconds = self.app.config['PUBLISH_SCHEDULER_REFRESH_SECONDS']
+        refreshed_at = 0.0
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                refresh = self._refresh or time.monotonic() - refreshed_at >= refresh_seconds
+                self._refresh = False
+            try:
+                with self.app.app_context():
+                    if refresh:
+                        refreshed_at = time.monotonic()
+                        self.schedule(db.session.execute(
+                            db.select(db.func.min(Blog.publish_at))
+                            .filter_by(published=False).where(Blog.publish_at.is_not(None))).scalar())
+                        db.session.commit()
+                    now = datetime.utcnow()
+                    if self._due(now):
+                        publish_due(now)
+            except Exception:
+                logger.exception('Publish scheduler error')
+
+            with self._condition:
+                timeout = max(0.0, refresh_seconds - (time.monotonic() - refreshed_at))
+                if self._heap:
+                    timeout = min(timeout, (self._heap[0] - datetime.utcnow()).total_seconds())
+                if not self._stopping and not self._refresh and timeout > 0:
+                    self._condition.wait(timeout)
+
+    def start(self, app=None):
+        if app is not None:
+            self.app = app
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._refresh = True
+        self._thread = threading.Thread(target=self._run, name='publish-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self._stopping = False
+
+
+publish_scheduler = PublishScheduler()
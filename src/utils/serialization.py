@@ -0,0 +1,86 @@
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import DateTime
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+# JSON provider that encodes with orjson when it is installed and
+# JSON_BACKEND allows it, and with Flask's stdlib encoder otherwise. Output
+# matches the default provider apart from non-ASCII text being sent as
+# UTF-8 instead of \u escapes.
+class FastJSONProvider(DefaultJSONProvider):
+    def __init__(self, app):
+        super().__init__(app)
+        backend = app.config.get('JSON_BACKEND', 'auto')
+        if backend == 'orjson' and orjson is None:
+            raise RuntimeError("JSON_BACKEND is 'orjson' but orjson is not installed")
+        self.use_orjson = orjson is not None and backend in ('auto', 'orjson')
+
+    def _orjson_options(self, indent=False):
+        # Datetimes go through self.default so they keep Flask's format
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode()
+        return super().dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj, indent=False):
+        if self.use_orjson:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options(indent))
+        if indent:
+            return super().dumps(obj, indent=2).encode()
+        return super().dumps(obj, separators=(',', ':')).encode()
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+def json_bytes(obj):
+    provider = current_app.json
+    if isinstance(provider, FastJSONProvider):
+        return provider.dumps_bytes(obj)
+    return provider.dumps(obj).encode()
+
+
+# Serializes Row tuples from session.execute(select(*columns)) straight into
+# response dicts, skipping ORM instances and per-row to_dict() calls.
+# Column positions and datetime handling are worked out once per query.
+class RowSerializer:
+    def __init__(self, columns, fields):
+        keys = [column.key for column in columns]
+        self.plain = []
+        self.temporal = []
+        for field in fields:
+            index = keys.index(field)
+            if isinstance(columns[index].type, DateTime):
+                self.temporal.append((field, index))
+            else:
+                self.plain.append((field, index))
+
+    def __call__(self, rows):
+        plain, temporal = self.plain, self.temporal
+        result = []
+        for row in rows:
+            item = {field: row[index] for field, index in plain}
+            for field, index in temporal:
+                value = row[index]
+                item[field] = value.isoformat() if value is not None else None
+            result.append(item)
+        return result
@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Response, request, send_file
+
+try:
+    import brotli
+except ImportError:  # optional: only pre-built .br files are served without it
+    brotli = None
+
+# app.3f2a9c1b.js, app-3f2a9c1b.css, ...
+FINGERPRINTED = re.compile(r'[.-][0-9a-f]{8,}\.[A-Za-z0-9]+$')
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'application/xml', 'image/svg+xml',
+                'image/x-icon', 'image/vnd.microsoft.icon', 'application/manifest+json')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticAsset:
+    __slots__ = ('path', 'mimetype', 'etag', 'cache_control', 'body', 'variants')
+
+    def __init__(self, path, mimetype, etag, cache_control, body, variants):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.cache_control = cache_control
+        self.body = body
+        self.variants = variants
+
+
+# In-memory manifest of the static folder, built once at startup so the hot
+# path never touches the filesystem: file bodies, content-hash ETags and
+# compressed variants are all precomputed.
+class StaticManifest:
+    def __init__(self):
+        self.root = None
+        self.index = None
+        self.assets = {}
+        self.urls = {}
+        self.max_inline_bytes = 0
+        self.min_compress_bytes = 0
+
+    def init_app(self, app):
+        app.config.setdefault('STATIC_MAX_INLINE_BYTES', 2 * 1024 * 1024)
+        app.config.setdefault('STATIC_MIN_COMPRESS_BYTES', 512)
+        self.max_inline_bytes = app.config['STATIC_MAX_INLINE_BYTES']
+        self.min_compress_bytes = app.config['STATIC_MIN_COMPRESS_BYTES']
+        self.root = app.static_folder
+        self.scan()
+        app.add_template_global(self.asset_url, 'asset_url')
+
+    def scan(self):
+        assets = {}
+        if self.root and os.path.isdir(self.root):
+            for dirpath, _, filenames in os.walk(self.root):
+                for filename in filenames:
+                    if filename.endswith(('.gz', '.br')):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    name = os.path.relpath(path, self.root).replace(os.sep, '/')
+                    assets[name] = self._load(name, path)
+
+        # Every asset is also reachable under a content-addressed name that
+        # templates link to via asset_url(), so it can be cached forever.
+        urls = {}
+        for name, asset in list(assets.items()):
+            if asset.cache_control == IMMUTABLE:
+                continue
+            base, ext = os.path.splitext(name)
+            alias = f'{base}.{asset.etag[:12]}{ext}'
+            assets[alias] = StaticAsset(asset.path, asset.mimetype, asset.etag, IMMUTABLE, asset.body, asset.variants)
+            urls[name] = '/' + alias
+
+        self.assets = assets
+        self.urls = urls
+        self.index = assets.get('index.html')
+
+    def _load(self, name, path):
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        etag = hashlib.sha256(data).hexdigest()[:32]
+        cache_control = IMMUTABLE if FINGERPRINTED.search(name) else REVALIDATE
+
+        if len(data) > self.max_inline_bytes:
+            return StaticAsset(path, mimetype, etag, cache_control, None, {})
+
+        variants = {}
+        if len(data) >= self.min_compress_bytes and mimetype.startswith(COMPRESSIBLE):
+            for encoding, suffix in ENCODINGS:
+                encoded = self._precompressed(path + suffix) or self._compress(encoding, data)
+                if encoded is not None and len(encoded) < len(data):
+                    variants[encoding] = encoded
+        return StaticAsset(path, mimetype, etag, cache_control, data, variants)
+
+    @staticmethod
+    def _precompressed(path):
+        if os.path.isfile(path):
+            with open(path, 'rb') as fh:
+                return fh.read()
+        return None
+
+    @staticmethod
+    def _compress(encoding, data):
+        if encoding == 'gzip':
+            return gzip.compress(data, compresslevel=9, mtime=0)
+        if encoding == 'br' and brotli is not None:
+            return brotli.compress(data, quality=11)
+        return None
+
+    def asset_url(self, name):
+        return self.urls.get(name, '/' + name)
+
+    def lookup(self, name):
+        return self.assets.get(name)
+
+    def response(self, asset):
+        encoding = self._negotiate(asset)
+        etag = f'{asset.etag}-{encoding}' if encoding else asset.etag
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        elif asset.body is None:
+            response = send_file(asset.path, mimetype=asset.mimetype, etag=False, conditional=False)
+        else:
+            response = Response(asset.variants.get(encoding, asset.body), mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = asset.cache_control
+        if asset.variants:
+            response.vary.add('Accept-Encoding')
+        return response
+
+    @staticmethod
+    def _negotiate(asset):
+        for encoding, _ in ENCODINGS:
+            if encoding in asset.variants and request.accept_encodings[encoding]:
+                return encoding
+        return None
+
+
+static_manifest = StaticManifest()
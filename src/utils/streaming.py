@@ -0,0 +1,99 @@
+import time
+
+from flask import Response, current_app, request, stream_with_context
+
+from src.models.routing import read_from_replica, reading_from_replica
+from src.models.user import db
+from src.utils.serialization import json_bytes
+
+
+def wants_stream(args):
+    return args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+
+# Run statement with yield_per so only one chunk of rows is in memory at a
+# time, serialize each chunk as it arrives and hand it to the server. The
+# body is generated after the view has returned, and so after @replica_read
+# has reset the session's routing; use_replica is the view's routing,
+# captured when the response was built.
+def _chunks(statement, serializer, use_replica):
+    chunk_rows = current_app.config['STREAM_CHUNK_ROWS']
+    with read_from_replica(use_replica):
+        result = db.session.execute(statement, execution_options={'yield_per': chunk_rows})
+        try:
+            for rows in result.partitions():
+                yield serializer(rows)
+        finally:
+            result.close()
+
+
+def stream_json_array(statement, serializer):
+    use_replica = reading_from_replica()
+
+    def generate():
+        yield b'['
+        first = True
+        for items in _chunks(statement, serializer, use_replica):
+            # Encode the chunk as one list and drop its brackets
+            body = json_bytes(items)[1:-1]
+            if not body:
+                continue
+            if not first:
+                yield b','
+            first = False
+            yield body
+        yield b']\n'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def stream_ndjson(statement, serializer, filename=None):
+    use_replica = reading_from_replica()
+
+    def generate():
+        for items in _chunks(statement, serializer, use_replica):
+            yield b''.join(json_bytes(item) + b'\n' for item in items)
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    if filename:
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+def wants_event_stream():
+    return request.accept_mimetypes.best == 'text/event-stream'
+
+
+# Server-Sent Events from a polled feed. fetch(since) returns
+# (items, next_since, has_more) and each item needs a 'seq', sent as the
+# event id so a reconnecting EventSource resumes from Last-Event-ID. The
+# session is closed between polls so no read transaction (and, on SQLite,
+# no WAL snapshot) stays open while waiting. The stream ends after
+# CHANGES_STREAM_SECONDS; clients reconnect automatically.
+def stream_events(fetch, since, event='change'):
+    poll = current_app.config['CHANGES_POLL_SECONDS']
+    duration = current_app.config['CHANGES_STREAM_SECONDS']
+    heartbeat = 15
+
+    def generate():
+        position = since
+        deadline = time.monotonic() + duration
+        last_sent = time.monotonic()
+        yield f'retry: {int(poll * 1000)}\n\n'.encode()
+        while time.monotonic() < deadline:
+            try:
+                items, position, has_more = fetch(position)
+            finally:
+                db.session.close()
+            for item in items:
+                yield f"id: {item['seq']}\nevent: {event}\ndata: ".encode() + json_bytes(item) + b'\n\n'
+                last_sent = time.monotonic()
+            if has_more:
+                continue
+            if time.monotonic() - last_sent >= heartbeat:
+                yield b': keep-alive\n\n'
+                last_sent = time.monotonic()
+            time.sleep(poll)
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,15 @@
+import os
+import sys
+# DON'T CHANGE THIS !!!
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from src.main import create_app, dispose_engines, init_database
+
+# Production entry point: gunicorn -c gunicorn.conf.py
+#
+# Importing this module does the startup work exactly once. With
+# preload_app the master imports it before forking, then closes its pooled
+# connections so no worker inherits them.
+app = create_app({'INIT_DATABASE': False})
+init_database(app)
+dispose_engines(app)
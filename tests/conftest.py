@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app  # noqa: E402
+from src.utils.auth import login_limiter  # noqa: E402
+
+
+# create_app() on a fresh SQLite file, which runs db.create_all() and every
+# migration. Background threads are not started.
+@pytest.fixture
+def app(tmp_path):
+    return create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}", 'TESTING': True})
+
+
+
+# Login attempts are rate limited per process; start each test with full
+# buckets.
+@pytest.fixture(autouse=True)
+def reset_login_limits():
+    yield
+    login_limiter.store.clear()
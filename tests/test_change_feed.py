@@ -0,0 +1,20 @@
+from benchmarks.common import ADMIN
+
+
+def feed(client, url, since):
+    return [(change['id'], change['op']) for change in client.get(f'{url}?since={since}').get_json()['changes']]
+
+
+def test_public_feed_leaves_out_never_published_drafts(app):
+    client = app.test_client()
+    assert client.post('/api/admin/login', json=ADMIN).status_code == 200
+    since = client.get('/api/blogs/changes').get_json()['since']
+
+    draft = client.post('/api/admin/blogs', json={'title': 'draft', 'content': 'body', 'published': False})
+    post = client.post('/api/admin/blogs', json={'title': 'post', 'content': 'body'})
+    draft, post = draft.get_json()['id'], post.get_json()['id']
+    client.put(f'/api/admin/blogs/{post}', json={'title': 'post', 'content': 'body', 'published': False})
+    client.delete(f'/api/admin/blogs/{draft}')
+
+    assert feed(client, '/api/blogs/changes', since) == [(post, 'delete')]
+    assert feed(client, '/api/admin/blogs/changes', since) == [(post, 'upsert'), (draft, 'delete')]
@@ -0,0 +1,70 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from src.main import create_app
+from src.models.blog import Blog
+from src.models.migrations import MIGRATIONS, run_migrations
+from src.models.user import db
+from src.utils.pagination import blog_columns, encode_cursor, keyset_page
+
+# The blog table as it was before the migration runner existed
+LEGACY_BLOG_TABLE = '''
+CREATE TABLE blog (
+    id INTEGER NOT NULL PRIMARY KEY,
+    title VARCHAR(200) NOT NULL,
+    content TEXT NOT NULL,
+    excerpt VARCHAR(500),
+    author VARCHAR(100) NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    published BOOLEAN NOT NULL,
+    category VARCHAR(100)
+)
+'''
+
+CURSOR = encode_cursor(datetime(2024, 1, 1), 100)
+
+
+def query_plan(statement):
+    sql = statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+def listing(published, cursor):
+    statement = db.select(*blog_columns(Blog.SUMMARY_FIELDS))
+    if published:
+        statement = statement.filter_by(published=True)
+    return keyset_page(statement, 20, cursor)
+
+
+@pytest.fixture
+def legacy_app(tmp_path):
+    path = tmp_path / 'legacy.db'
+    with sqlite3.connect(path) as conn:
+        conn.execute(LEGACY_BLOG_TABLE)
+    return create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'TESTING': True})
+
+
+@pytest.mark.parametrize('database', ['app', 'legacy_app'])
+@pytest.mark.parametrize('published, index', [
+    (True, 'ix_blog_published_created_at'),
+    (False, 'ix_blog_created_at'),
+])
+@pytest.mark.parametrize('cursor', [None, CURSOR], ids=['first-page', 'cursor-page'])
+def test_listing_plan_uses_index_without_sort(request, database, published, index, cursor):
+    app = request.getfixturevalue(database)
+    with app.app_context():
+        plan = query_plan(listing(published, cursor))
+    assert f'INDEX {index}' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_migrations_bring_legacy_database_to_latest_version(legacy_app):
+    with legacy_app.app_context():
+        assert run_migrations() == MIGRATIONS[-1][0]
+        indexes = {row[0] for row in db.session.execute(
+            db.text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'blog'"))}
+    assert {'ix_blog_published_created_at', 'ix_blog_created_at', 'ix_blog_category'} <= indexes
@@ -0,0 +1,99 @@
+import pytest
+
+from benchmarks.common import ADMIN
+from src.main import create_app
+from src.models.blog import Blog
+from src.models.routing import replica_read
+from src.models.user import User, db
+
+
+def seed(url, title):
+    seed_app = create_app({'SQLALCHEMY_DATABASE_URI': url})
+    with seed_app.app_context():
+        db.session.add(Blog(title=title, content=f'{title} body', published=True))
+        db.session.add(User(username=title, email=f"{title.replace(' ', '-')}@example.com"))
+        db.session.commit()
+        db.engine.dispose()
+
+
+def titles(url):
+    with create_app({'SQLALCHEMY_DATABASE_URI': url, 'INIT_DATABASE': False}).app_context():
+        return set(db.session.execute(db.select(Blog.title)).scalars())
+
+
+# Two SQLite files with the same schema and different posts, so every
+# response shows which database it was read from. Nothing replicates
+# between them.
+@pytest.fixture
+def urls(tmp_path):
+    primary, replica = f"sqlite:///{tmp_path / 'primary.db'}", f"sqlite:///{tmp_path / 'replica.db'}"
+    seed(primary, 'on primary')
+    seed(replica, 'on replica')
+    return primary, replica
+
+
+@pytest.fixture
+def app(urls):
+    primary, replica = urls
+    app = create_app({'SQLALCHEMY_DATABASE_URI': primary, 'DATABASE_REPLICA_URL': replica, 'TESTING': True})
+
+    # A replica view that writes, to check where the flush goes
+    @app.route('/test/replica-write', methods=['POST'])
+    @replica_read
+    def replica_write():
+        db.session.add(Blog(title='flushed', content='flushed body'))
+        db.session.flush()
+        db.session.execute(db.update(Blog).where(Blog.title == 'on primary').values(category='updated'))
+        db.session.commit()
+        return {'titles': sorted(db.session.execute(db.select(Blog.title)).scalars())}
+
+    return app
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    assert client.post('/api/admin/login', json=ADMIN).status_code == 200
+    return client
+
+
+def test_public_views_read_the_replica(client):
+    blogs = client.get('/api/blogs').get_json()['blogs']
+    assert [blog['title'] for blog in blogs] == ['on replica']
+    assert client.get('/api/blogs/1').get_json()['title'] == 'on replica'
+
+
+def test_streamed_responses_read_the_replica(client):
+    # The body is generated after the view (and @replica_read) has returned
+    assert [user['username'] for user in client.get('/api/users').get_json()] == ['on replica']
+    assert [user['username'] for user in client.get('/api/users?stream=1').get_json()] == ['on replica']
+
+
+def test_admin_reads_use_the_primary(client):
+    blogs = client.get('/api/admin/blogs').get_json()['blogs']
+    assert [blog['title'] for blog in blogs] == ['on primary']
+
+
+def test_admin_writes_go_to_the_primary(client, urls):
+    primary, replica = urls
+    response = client.post('/api/admin/blogs', json={'title': 'new post', 'content': 'new body'})
+    assert response.status_code == 201
+    assert 'new post' in titles(primary)
+    assert 'new post' not in titles(replica)
+
+
+def test_flushes_in_replica_views_go_to_the_primary(client, urls):
+    primary, replica = urls
+    response = client.post('/test/replica-write')
+    # The view's own read afterwards still comes from the replica
+    assert response.get_json()['titles'] == ['on replica']
+    assert titles(primary) == {'on primary', 'flushed'}
+    assert titles(replica) == {'on replica'}
+    with create_app({'SQLALCHEMY_DATABASE_URI': primary, 'INIT_DATABASE': False}).app_context():
+        assert db.session.execute(db.select(Blog.category).filter_by(title='on primary')).scalar() == 'updated'
+
+
+def test_without_a_replica_everything_uses_the_primary(urls):
+    primary, _ = urls
+    client = create_app({'SQLALCHEMY_DATABASE_URI': primary, 'TESTING': True}).test_client()
+    assert [blog['title'] for blog in client.get('/api/blogs').get_json()['blogs']] == ['on primary']
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.common import ADMIN
+from src.models.blog import Blog
+from src.models.user import db
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    assert client.post('/api/admin/login', json=ADMIN).status_code == 200
+    return client
+
+
+def titles(client):
+    return [blog['title'] for blog in client.get('/api/blogs').get_json()['blogs']]
+
+
+# No scheduler thread runs in tests, so only the read path can publish
+def test_due_posts_are_published_before_public_reads(app, client):
+    publish_at = (datetime.utcnow() + timedelta(hours=1)).isoformat()
+    response = client.post('/api/admin/blogs', json={'title': 'scheduled', 'content': 'body', 'publish_at': publish_at})
+    blog_id = response.get_json()['id']
+    assert titles(client) == []
+    assert client.get(f'/api/blogs/{blog_id}').status_code == 404
+
+    # Let the hour pass
+    with app.app_context():
+        db.session.execute(db.update(Blog).filter_by(id=blog_id).values(publish_at=datetime.utcnow()))
+        db.session.commit()
+
+    assert titles(client) == ['scheduled']
+    assert client.get(f'/api/blogs/{blog_id}').get_json()['published'] is True
+    assert sum(facet['count'] for facet in client.get('/api/blogs/facets').get_json()['month']) == 1
@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+from benchmarks.common import ADMIN, percentile
+from src.main import create_app
+
+# A short run of benchmarks/sqlite_concurrency.py; the bound is loose so a
+# busy test machine does not fail it, while a reader waiting out the busy
+# timeout behind the writer (seconds) still does.
+DURATION = 1.0
+READERS = 4
+MAX_P99_MS = 500
+
+
+def test_readers_and_a_writer_do_not_lock_each_other_out(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'stress.db'}",
+        # Measure the database, not the response cache
+        'BLOG_CACHE_MAX_ENTRIES': 0,
+        'TESTING': True,
+    })
+    writer = app.test_client()
+    assert writer.post('/api/admin/login', json=ADMIN).status_code == 200
+    ids = [writer.post('/api/admin/blogs', json={'title': f'Post {i}', 'content': 'body ' * 200}).get_json()['id']
+           for i in range(100)]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies, errors, writes = [], [], [0]
+
+    def record_error(error):
+        with lock:
+            errors.append(error)
+
+    def read_loop(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        local = []
+        while not stop.is_set():
+            url = f'/api/blogs/{rng.choice(ids)}' if rng.random() < 0.7 else '/api/blogs?limit=20'
+            start = time.perf_counter()
+            try:
+                response = client.get(url)
+                if response.status_code >= 500:
+                    record_error(response.get_data(as_text=True))
+            except OperationalError as exc:
+                record_error(repr(exc))
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    def write_loop():
+        rng = random.Random(0)
+        while not stop.is_set():
+            try:
+                if rng.random() < 0.5:
+                    response = writer.post('/api/admin/blogs', json={'title': 'New', 'content': 'body ' * 200})
+                else:
+                    response = writer.put(f'/api/admin/blogs/{rng.choice(ids)}',
+                                          json={'title': 'Edited', 'content': 'edited'})
+                if response.status_code >= 500:
+                    record_error(response.get_data(as_text=True))
+                writes[0] += 1
+            except OperationalError as exc:
+                record_error(repr(exc))
+
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(READERS)]
+    threads.append(threading.Thread(target=write_loop))
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not [error for error in errors if 'database is locked' in error]
+    assert not errors
+    assert writes[0] > 0 and latencies
+    assert percentile(latencies, 99) < MAX_P99_MS